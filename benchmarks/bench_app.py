@@ -0,0 +1,86 @@
+"""Cold start and rerun time of each page of the Streamlit app.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_app --rows 20000 --reruns 10
+
+Builds a synthetic ledger, then for every page starts a fresh interpreter
+that runs ``app.py`` headless (``streamlit.testing``) with that page
+selected. Reports the first run, which includes importing the page module
+and its dependencies, the median of ``--reruns`` further reruns, and whether
+``plotly.express`` was loaded. Streamlit itself imports the base ``plotly``
+package; Plotly Express, the expensive part, should be loaded by the
+Dashboard only.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+PAGES = ("Dashboard", "İşlem Ekle", "Banka Hesapları", "Kredi Kartları", "Nakit Paralar", "Yemek Kartları", "Ayarlar")
+
+
+def child(page, reruns):
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    imported = time.perf_counter()
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state['page'] = page
+    at.run()
+    first = time.perf_counter()
+    if at.exception:
+        raise SystemExit(f"{page}: {at.exception[0].value}")
+
+    times = []
+    for _ in range(reruns):
+        t = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t)
+    print(json.dumps({
+        'page': page,
+        'import_ms': round((imported - start) * 1000, 1),
+        'first_run_ms': round((first - imported) * 1000, 1),
+        'rerun_ms': round(statistics.median(times) * 1000, 1) if times else None,
+        'plotly_express': 'plotly.express' in sys.modules,
+    }, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20_000, help="rows in the synthetic ledger")
+    parser.add_argument('--reruns', type=int, default=10)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.reruns)
+        return
+
+    from findash import db, writer
+    from findash.generator import write_synthetic
+    from findash.schema import init_db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        init_db(path)
+        writer.write(write_synthetic, args.rows, seed=7, path=path)
+        writer.close_writers()
+        db.close_pools()
+
+        env = dict(os.environ, DATABASE_URL=path, FINDASH_METRICS_LOG=os.path.join(tmp, 'metrics.jsonl'))
+        print(f"{'page':<16}{'import ms':>10}{'first run ms':>14}{'rerun ms':>10}  plotly.express")
+        for page in PAGES:
+            out = subprocess.run([sys.executable, '-m', 'benchmarks.bench_app', '--child', page,
+                                  '--reruns', str(args.reruns)],
+                                 env=env, capture_output=True, text=True, check=True).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(f"{r['page']:<16}{r['import_ms']:>10}{r['first_run_ms']:>14}{r['rerun_ms']:>10}  {r['plotly_express']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Dashboard aggregations on each query backend at large ledger sizes.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_backends --scales 1000000 10000000
+    python -m benchmarks.bench_backends --scales 100000 --backends pandas duckdb --repeat 3
+
+For every scale a fresh database is filled by ``findash.generator`` and its
+columnar snapshot is written. Each backend then computes the monthly
+summary and the top expenses of all time and of one month; results are
+checked against the ``sqlite`` backend. ``sqlite_scan`` is the same monthly
+GROUP BY run over the raw ``transactions`` table, the cost the maintained
+``monthly_summary`` table avoids. Backends whose package is not installed
+are skipped.
+"""
+import argparse
+import datetime
+import os
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+from findash import db, writer
+from findash.backends import BACKENDS, make_backend
+from findash.generator import write_synthetic
+from findash.ledger import LedgerCache, LedgerStore
+from findash.schema import init_db
+
+SEED = 42
+END_DATE = datetime.date(2025, 12, 31)
+MONTH = '2025-06'
+
+RAW_MONTHS_SQL = """
+    SELECT substr(date, 1, 7) AS month, type, category, payment_method, SUM(amount) AS total, COUNT(*) AS count
+    FROM transactions
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, round(statistics.median(times), 2)
+
+
+def normalized(summary: pd.DataFrame) -> pd.DataFrame:
+    keys = ['month', 'type', 'category', 'payment_method']
+    return summary[keys + ['total', 'count']].sort_values(keys).reset_index(drop=True)
+
+
+def run_scale(rows, backends, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        init_db(path)
+        start = time.perf_counter()
+        with db.transaction(path) as conn:
+            write_synthetic(conn, rows, seed=SEED, days=3650, end=END_DATE)
+        print(f"{rows:>12,} generate {time.perf_counter() - start:8.1f}s")
+        LedgerCache(path).reload(save_snapshot=True)
+
+        def raw_scan():
+            with db.connection(path) as conn:
+                return pd.read_sql_query(RAW_MONTHS_SQL, conn)
+
+        _, ms = measure(raw_scan, repeat)
+        print(f"{rows:>12,} {'sqlite_scan':8} {'monthly_summary':18}{ms:10.2f} ms")
+
+        expected = None
+        for name in backends:
+            store = LedgerStore(path)
+            try:
+                backend = make_backend(store, name)
+            except ImportError as e:
+                print(f"{rows:>12,} {name:8} skipped: {e}")
+                continue
+            if name != 'sqlite':
+                # Defter bir kez yüklenir (anlık görüntüden); ölçülen yalnızca sorgulardır
+                start = time.perf_counter()
+                store.ledger.transactions
+                print(f"{rows:>12,} {name:8} {'load_ledger':18}{(time.perf_counter() - start) * 1000:10.2f} ms")
+            summary, ms = measure(backend.monthly_summary, repeat)
+            print(f"{rows:>12,} {name:8} {'monthly_summary':18}{ms:10.2f} ms")
+            for label, month in (('top_expenses', None), ('top_expenses_month', MONTH)):
+                _, ms = measure(lambda: backend.top_expenses(month), repeat)
+                print(f"{rows:>12,} {name:8} {label:18}{ms:10.2f} ms")
+            if expected is None:
+                expected = normalized(summary)
+            else:
+                pd.testing.assert_frame_equal(normalized(summary), expected, check_dtype=False)
+        writer.close_writers()
+        db.close_pools()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--backends', nargs='+', default=['sqlite', 'pandas', 'duckdb'], choices=sorted(BACKENDS))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    for rows in args.scales:
+        run_scale(rows, args.backends, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
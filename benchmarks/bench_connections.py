@@ -0,0 +1,150 @@
+"""Per-operation latency of the pooled connection layer vs. connect-per-call.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_connections --ops 2000 --threads 4
+
+The "before" column reproduces the old helpers: a fresh ``sqlite3.connect``
+with the default rollback journal for every statement. The "after" column
+goes through ``findash.db`` (pooled WAL connections, cached statements).
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from findash import db
+
+SCHEMA = (
+    "CREATE TABLE transactions (id TEXT PRIMARY KEY, date TEXT, type TEXT, category TEXT,"
+    " amount REAL, description TEXT, payment_method TEXT)",
+    "CREATE TABLE bank_accounts (id TEXT PRIMARY KEY, name TEXT, balance REAL, currency TEXT, account_type TEXT)",
+    "INSERT INTO bank_accounts VALUES ('1', 'Ziraat Bankası', 1000.0, 'TRY', 'Banka')",
+)
+
+INSERT_SQL = ("INSERT INTO transactions(id, date, type, category, amount, description, payment_method)"
+              " VALUES (?, ?, ?, ?, ?, ?, ?)")
+SELECT_SQL = "SELECT * FROM transactions WHERE id = ?"
+UPDATE_SQL = "UPDATE bank_accounts SET balance = balance + ? WHERE name = ?"
+
+
+def _make_db(directory, name):
+    path = os.path.join(directory, name)
+    conn = sqlite3.connect(path)
+    for stmt in SCHEMA:
+        conn.execute(stmt)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _row(i):
+    return (f"{threading.get_ident()}-{i}", "2024-01-01T00:00:00", "Expense", "Yemek", 12.5, "bench", "Ziraat Bankası")
+
+
+class Legacy:
+    """Old behaviour: connect, execute, commit and close for every call."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, sql, params):
+        conn = sqlite3.connect(self.path)
+        conn.execute(sql, params)
+        conn.commit()
+        conn.close()
+
+    def read(self, sql, params):
+        conn = sqlite3.connect(self.path)
+        conn.execute(sql, params).fetchone()
+        conn.close()
+
+
+class Pooled:
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, sql, params):
+        with db.transaction(self.path) as conn:
+            conn.execute(sql, params)
+
+    def read(self, sql, params):
+        with db.connection(self.path) as conn:
+            conn.execute(sql, params).fetchone()
+
+
+def _time_ops(backend, ops):
+    timings = {'insert': [], 'select': [], 'update': []}
+    errors = 0
+    for i in range(ops):
+        row = _row(i)
+        for name, call in (
+            ('insert', lambda: backend.write(INSERT_SQL, row)),
+            ('select', lambda: backend.read(SELECT_SQL, (row[0],))),
+            ('update', lambda: backend.write(UPDATE_SQL, (-row[4], row[6]))),
+        ):
+            start = time.perf_counter()
+            try:
+                call()
+            except sqlite3.OperationalError:
+                errors += 1
+                continue
+            timings[name].append(time.perf_counter() - start)
+    return timings, errors
+
+
+def run(backend, ops, threads):
+    results = [None] * threads
+
+    def worker(idx):
+        results[idx] = _time_ops(backend, ops)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    merged = {'insert': [], 'select': [], 'update': []}
+    errors = 0
+    for timings, errs in results:
+        errors += errs
+        for name, values in timings.items():
+            merged[name].extend(values)
+    return merged, errors, elapsed
+
+
+def _fmt(values):
+    if not values:
+        return "      -       -"
+    values = sorted(values)
+    p95 = values[int(len(values) * 0.95) - 1]
+    return f"{statistics.mean(values) * 1e6:7.0f} {p95 * 1e6:7.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ops', type=int, default=1000, help="operations per thread")
+    parser.add_argument('--threads', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = run(Legacy(_make_db(tmp, 'before.db')), args.ops, args.threads)
+        after = run(Pooled(_make_db(tmp, 'after.db')), args.ops, args.threads)
+        db.close_pools()
+
+    print(f"{args.threads} thread(s) x {args.ops} ops, latency in microseconds (mean / p95)")
+    print(f"{'op':<8}{'before':>16}{'after':>16}")
+    for name in ('insert', 'select', 'update'):
+        print(f"{name:<8}{_fmt(before[0][name]):>16}{_fmt(after[0][name]):>16}")
+    print(f"{'locked':<8}{before[1]:>16}{after[1]:>16}")
+    print(f"{'wall s':<8}{before[2]:>16.2f}{after[2]:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
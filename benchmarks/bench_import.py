@@ -0,0 +1,64 @@
+"""Throughput of the streaming statement import.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_import --rows 1000000
+
+Writes a synthetic CSV statement to a temporary directory and imports it
+into a fresh database through ``findash.importer.import_csv``.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from findash import db
+from findash.importer import import_csv
+from findash.schema import init_db
+
+CATEGORIES = ["Maaş", "Kira", "Eğlence", "Alışveriş", "Kıyafet", "Yemek", "Sağlık", "Seyahat"]
+
+
+def write_statement(path, rows, seed=42):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650, rows), unit='D')
+    amounts = np.round(rng.uniform(-2500, 2500, rows), 2)
+    pd.DataFrame({
+        'Tarih': dates.strftime('%d.%m.%Y'),
+        'Açıklama': 'Ekstre satırı ' + pd.Series(rng.integers(0, 10_000, rows)).astype(str),
+        'Kategori': rng.choice(CATEGORIES, rows),
+        'Tutar': amounts,
+    }).to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'statement.csv')
+        db_path = os.path.join(tmp, 'bench.db')
+        start = time.perf_counter()
+        write_statement(csv_path, args.rows)
+        print(f"generated {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+
+        init_db(db_path)
+        with db.transaction(db_path) as conn:
+            conn.execute("INSERT INTO bank_accounts(name, balance, currency, account_type)"
+                         " VALUES ('Ziraat Bankası', 0, 'TRY', 'Banka')")
+
+        mapping = {'date': 'Tarih', 'amount': 'Tutar', 'description': 'Açıklama', 'category': 'Kategori'}
+        result = import_csv(csv_path, mapping, payment_method='Ziraat Bankası', dayfirst=True,
+                            date_format='%d.%m.%Y', chunksize=args.chunksize, path=db_path)
+        db.close_pools()
+
+    print(f"imported {result['rows']:,} rows in {result['seconds']:.2f}s ({result['rows_per_sec']:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Memory and group-by cost of the plain vs. compact in-memory ledger.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_ledger_memory --rows 3000000
+
+Fills a temporary ``transactions`` table with synthetic rows, then loads it
+once as ``read_sql_query`` returns it and once through
+``findash.compact.read_compact``, and reports frame size, load time and a
+month x category group-by on each.
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from findash.compact import memory_bytes, read_compact
+from findash.ledger import TRANSACTIONS_SQL
+from findash.schema import TRANSACTIONS_DDL
+
+CATEGORIES = ["Maaş", "Kira", "Eğlence", "Alışveriş", "Kıyafet", "Yemek", "Sağlık", "Seyahat"]
+PAYMENT_METHODS = ["Ziraat Bankası", "Garanti BBVA", "Bonus Kredi Kartı", "Cüzdan", "Sodexo"]
+
+
+def fill(conn, rows, seed=42, batch=250_000):
+    rng = np.random.default_rng(seed)
+    conn.execute(TRANSACTIONS_DDL.format(table='transactions'))
+    start = np.datetime64('2015-01-01T00:00:00')
+    for offset in range(0, rows, batch):
+        n = min(batch, rows - offset)
+        dates = np.datetime_as_string(start + rng.integers(0, 3650 * 86400, n).astype('timedelta64[s]'))
+        is_income = rng.random(n) > 0.7
+        conn.executemany(
+            "INSERT INTO transactions(date, type, category, amount, description, payment_method) VALUES (?, ?, ?, ?, ?, ?)",
+            zip(dates.tolist(), np.where(is_income, 'Income', 'Expense').tolist(),
+                rng.choice(CATEGORIES, n).tolist(), np.round(rng.uniform(5, 2500, n), 2).tolist(),
+                np.where(is_income, 'Demo Income', 'Demo Expense').tolist(), rng.choice(PAYMENT_METHODS, n).tolist()),
+        )
+    conn.commit()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def measure_plain(conn):
+    """Size, load and group-by time of the ledger read as a plain frame."""
+    plain, plain_load = timed(lambda: pd.read_sql_query(TRANSACTIONS_SQL, conn, parse_dates=['date']))
+    plain_mb = memory_bytes(plain) / 2**20
+    # pandas < 3 metni Python nesnesi olarak tutar; o düzenin boyutu da raporlanır
+    object_mb = memory_bytes(plain.astype({c: object for c in plain.columns if plain[c].dtype == 'str'})) / 2**20
+    _, plain_group = timed(lambda: plain.groupby([plain['date'].dt.to_period('M'), 'category'])['amount'].sum())
+    return plain_mb, object_mb, plain_load, plain_group
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=3_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+        _, seconds = timed(lambda: fill(conn, args.rows))
+        print(f"generated {args.rows:,} rows in {seconds:.1f}s")
+
+        # Düz çerçeve yardımcı fonksiyonun içinde kalır; sıkıştırılmış düzen ölçülürken bellekte değildir
+        plain_mb, object_mb, plain_load, plain_group = measure_plain(conn)
+
+        compact, compact_load = timed(lambda: read_compact(conn, TRANSACTIONS_SQL))
+        compact_mb = memory_bytes(compact) / 2**20
+        _, compact_group = timed(lambda: compact.groupby(['period', 'category'], observed=True)['amount_minor'].sum())
+        conn.close()
+
+    print(f"{'':10}{'MB':>10}{'load s':>10}{'groupby s':>12}")
+    print(f"{'object':10}{object_mb:10.1f}")
+    print(f"{'plain':10}{plain_mb:10.1f}{plain_load:10.2f}{plain_group:12.3f}")
+    print(f"{'compact':10}{compact_mb:10.1f}{compact_load:10.2f}{compact_group:12.3f}")
+    print(f"memory x{plain_mb / compact_mb:.1f} (x{object_mb / compact_mb:.1f} vs object), groupby x{plain_group / compact_group:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""Timings of the main DB and dashboard paths at several ledger sizes.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_suite --scales 10000 100000 1000000 --output results.json
+    python -m benchmarks.bench_suite --scales 10000 --compare results.json
+
+For every scale a fresh database is filled by ``findash.generator`` with a
+fixed seed, then each operation runs ``--repeat`` times. Median and best
+times in milliseconds are written as JSON, so runs from different commits
+can be compared with ``--compare``.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from findash import db, writer
+from findash.balances import account_monthly_totals, balance_as_of, load_account_page
+from findash.generator import write_synthetic
+from findash.ledger import LedgerCache, LedgerStore
+from findash.queries import load_transactions_page
+from findash.schema import init_db
+from findash.transactions import delete_transaction, insert_transaction, update_transaction
+
+SEED = 42
+END_DATE = datetime.date(2025, 12, 31)
+
+
+def measure(fn, repeat):
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        times.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': round(statistics.median(times), 3), 'best_ms': round(min(times), 3)}
+
+
+def operations(path, rows, rng):
+    """Named callables taking the repetition index."""
+    ids = rng.integers(1, rows + 1, 1000).tolist()
+    middle = END_DATE - datetime.timedelta(days=180)
+
+    def load_ledger(_):
+        LedgerCache(path).reload(save_snapshot=False)
+
+    def load_ledger_snapshot(_):
+        LedgerCache(path).reload()
+
+    def dashboard(_):
+        store = LedgerStore(path)
+        store.sync()
+        summary = store.monthly_summary()
+        summary.groupby('type')['total_base'].sum()
+        summary[summary['type'] == 'Expense'].groupby('category')['total_base'].sum()
+        store.top_expenses()
+
+    def deep_page(_):
+        cursor = None
+        for _ in range(20):
+            _, cursor = load_transactions_page({}, cursor, path=path)
+
+    def account_ledger(_):
+        cursor = None
+        with db.connection(path) as conn:
+            account_monthly_totals(conn, 'Ziraat Bankası')
+            for _ in range(20):
+                _, cursor = load_account_page(conn, 'Ziraat Bankası', cursor)
+
+    def as_of(i):
+        with db.connection(path) as conn:
+            balance_as_of(conn, 'Ziraat Bankası', middle - datetime.timedelta(days=i))
+
+    return {
+        'load_ledger': load_ledger,
+        'save_snapshot': lambda _: LedgerCache(path).reload(save_snapshot=True),
+        'load_ledger_snapshot': load_ledger_snapshot,
+        'add': lambda i: insert_transaction('Expense', 10 + i, 'Yemek', END_DATE, 'bench', 'Cüzdan', path=path),
+        'update': lambda i: update_transaction(ids[i], 'Expense', 20 + i, 'Kira', middle, 'bench', 'Cüzdan', path=path),
+        'delete': lambda i: delete_transaction(ids[-1 - i], path=path),
+        'filter_type': lambda _: load_transactions_page({'t_type': 'Expense'}, path=path),
+        'filter_date_range': lambda _: load_transactions_page(
+            {'min_date': middle - datetime.timedelta(days=30), 'max_date': middle}, path=path),
+        'filter_category': lambda _: load_transactions_page({'category': 'Sağlık'}, path=path),
+        'page_20_deep': deep_page,
+        'search': lambda i: load_transactions_page({'search': ['migros', 'bilet', 'eczane'][i % 3]}, path=path),
+        'dashboard_aggregations': dashboard,
+        'balance_as_of': as_of,
+        'account_ledger_20_deep': account_ledger,
+    }
+
+
+def run_scale(rows, repeat, accounts):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        init_db(path)
+        start = time.perf_counter()
+        with db.transaction(path) as conn:
+            write_synthetic(conn, rows, seed=SEED, accounts=accounts, days=3650, end=END_DATE)
+        results = {'generate': {'median_ms': round((time.perf_counter() - start) * 1000, 3)}}
+        print(f"{rows:>12,} generate {results['generate']['median_ms'] / 1000:8.1f}s")
+
+        for name, fn in operations(path, rows, np.random.default_rng(SEED)).items():
+            results[name] = measure(fn, repeat)
+            print(f"{rows:>12,} {name:24}{results[name]['median_ms']:10.2f} ms")
+        writer.close_writers()
+        db.close_pools()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--accounts', type=int, default=12)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="earlier JSON result to compare medians against")
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'pandas': pd.__version__,
+            'seed': SEED,
+            'repeat': args.repeat,
+        },
+        'results': {str(rows): run_scale(rows, args.repeat, args.accounts) for rows in args.scales},
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"saved {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        for scale, ops in report['results'].items():
+            for name, timing in ops.items():
+                old = baseline.get(scale, {}).get(name)
+                if old:
+                    print(f"{scale:>12} {name:24}{timing['median_ms'] / old['median_ms']:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
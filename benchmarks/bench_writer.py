@@ -0,0 +1,83 @@
+"""Concurrent write throughput: one transaction per write vs. the writer queue.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_writer --threads 16 --writes 200
+
+Each of ``--threads`` threads inserts ``--writes`` transactions into a fresh
+database, first with its own ``BEGIN IMMEDIATE`` ... ``COMMIT`` per write
+(the previous behaviour), then through ``findash.writer``, which batches the
+writes arriving together into one commit. Reports writes per second and the
+number of ``database is locked`` failures.
+"""
+import argparse
+import datetime
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from findash import db, writer
+from findash.generator import write_synthetic
+from findash.schema import init_db
+from findash.transactions import insert_row
+
+DATE = datetime.date(2025, 6, 1)
+
+
+def run(threads, writes, write_one):
+    failures = []
+    barrier = threading.Barrier(threads)
+
+    def worker(n):
+        barrier.wait()
+        for i in range(writes):
+            try:
+                write_one(n, i)
+            except sqlite3.OperationalError as e:
+                failures.append(e)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start, len(failures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--writes', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=10_000, help="rows in the ledger before the run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('per_write', 'queue'):
+            path = os.path.join(tmp, f'{mode}.db')
+            init_db(path)
+            with db.transaction(path) as conn:
+                write_synthetic(conn, args.rows)
+
+            def per_write(n, i):
+                with db.transaction(path) as conn:
+                    insert_row(conn, 'Expense', 10 + i, 'Yemek', DATE, f'bench {n}', 'Cüzdan')
+
+            def queued(n, i):
+                writer.write(insert_row, 'Expense', 10 + i, 'Yemek', DATE, f'bench {n}', 'Cüzdan', path=path)
+
+            seconds, failed = run(args.threads, args.writes, per_write if mode == 'per_write' else queued)
+            total = args.threads * args.writes
+            line = f"{mode:10}{total / seconds:10,.0f} writes/s  {failed} locked"
+            if mode == 'queue':
+                queue = writer.get_writer(path)
+                line += f"  {queue.batches} commits ({queue.writes / max(queue.batches, 1):.1f} writes/commit)"
+            print(line)
+        writer.close_writers()
+        db.close_pools()
+
+
+if __name__ == '__main__':
+    main()
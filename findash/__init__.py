@@ -0,0 +1 @@
+"""Storage layer for the Chill finance dashboard."""
@@ -0,0 +1,5 @@
+import sys
+
+from findash.cli import main
+
+sys.exit(main())
@@ -0,0 +1,105 @@
+"""Account writes, whole-ledger resets and the archival of closed years.
+
+Like the row operations in ``findash.transactions`` these take the writer's
+connection as their first argument, so callers queue them with
+``findash.writer.write`` (or run them inside their own transaction).
+"""
+import datetime
+import os
+import sqlite3
+
+from findash.archive import archive_file, main_file
+from findash.ledger import ACCOUNTS_VERSION_KEY, bump_version
+from findash.schema import TRANSACTIONS_COLUMNS, TRANSACTIONS_DDL, create_transaction_indexes
+from findash.search import create_search_index
+from findash.snapshot import reset_change_log
+
+ARCHIVE_CHUNK_SIZE = 50_000
+
+
+def load_accounts(conn) -> list:
+    return [dict(r) for r in conn.execute("SELECT * FROM bank_accounts ORDER BY id").fetchall()]
+
+
+def insert_account(conn, acc: dict) -> int:
+    """Adds an account whose opening balance is its initial balance; returns its id."""
+    cur = conn.execute(
+        "INSERT INTO bank_accounts(name, balance, currency, account_type, opening_balance) VALUES (?, ?, ?, ?, ?)",
+        (acc['name'], acc['balance'], acc['currency'], acc['account_type'], acc['balance']),
+    )
+    bump_version(conn, ACCOUNTS_VERSION_KEY)
+    return cur.lastrowid
+
+
+def delete_account(conn, acc_id: int):
+    conn.execute("DELETE FROM bank_accounts WHERE id = ?", (acc_id,))
+    bump_version(conn, ACCOUNTS_VERSION_KEY)
+
+
+def clear_ledger(conn):
+    """Deletes every transaction, account and derived aggregate; archive files are unregistered."""
+    conn.execute("DELETE FROM transactions")
+    conn.execute("DELETE FROM bank_accounts")
+    conn.execute("DELETE FROM monthly_summary")
+    conn.execute("DELETE FROM balance_checkpoints")
+    conn.execute("DELETE FROM archives")
+    reset_change_log(conn)
+    bump_version(conn)
+    bump_version(conn, ACCOUNTS_VERSION_KEY)
+
+
+def _write_archive(target: str, rows):
+    """Writes ``rows`` (id first, then ``TRANSACTIONS_COLUMNS``) into a new archive file."""
+    if os.path.exists(target):
+        os.remove(target)
+    columns = ('id',) + TRANSACTIONS_COLUMNS
+    out = sqlite3.connect(target)
+    try:
+        out.execute(TRANSACTIONS_DDL.format(table='transactions'))
+        while chunk := rows.fetchmany(ARCHIVE_CHUNK_SIZE):
+            out.executemany(f"INSERT INTO transactions({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", chunk)
+        # İndeksler ve arama dizini satırlardan sonra tek geçişte kurulur
+        create_transaction_indexes(out)
+        create_search_index(out)
+        out.commit()
+    except BaseException:
+        out.close()
+        os.remove(target)
+        raise
+    out.close()
+
+
+def archive_year(conn, year: int) -> dict:
+    """Moves the ledger rows of a closed ``year`` into its archive file.
+
+    The file is committed first. Its registration in ``archives`` and the
+    deletion from ``transactions`` commit with the caller's transaction, so
+    if that rolls back, the file is simply left unregistered. Balances and
+    the monthly aggregates are not touched.
+    """
+    year = int(year)
+    if year >= datetime.date.today().year:
+        raise ValueError(f"{year} yılı henüz kapanmadı; yalnızca geçmiş yıllar arşivlenebilir.")
+    if conn.execute("SELECT 1 FROM archives WHERE year = ?", (year,)).fetchone():
+        raise ValueError(f"{year} yılı zaten arşivlendi.")
+    start, end = f"{year}-01-01", f"{year + 1}-01-01"
+    count, min_date, max_date = conn.execute(
+        "SELECT COUNT(*), MIN(date), MAX(date) FROM transactions WHERE date >= ? AND date < ?", (start, end)
+    ).fetchone()
+    if not count:
+        raise ValueError(f"{year} yılına ait işlem yok.")
+
+    target = archive_file(main_file(conn), year)
+    _write_archive(target, conn.execute(
+        f"SELECT id, {', '.join(TRANSACTIONS_COLUMNS)} FROM transactions WHERE date >= ? AND date < ? ORDER BY date, id",
+        (start, end),
+    ))
+    conn.execute("DELETE FROM transactions WHERE date >= ? AND date < ?", (start, end))
+    conn.execute(
+        "INSERT INTO archives(year, file, rows, min_date, max_date) VALUES (?, ?, ?, ?, ?)",
+        (year, os.path.basename(target), count, min_date, max_date),
+    )
+    # Silinen satırlar değişiklik kaydına tek tek düştü; anlık görüntü baştan kurulur
+    reset_change_log(conn)
+    bump_version(conn)
+    return {'year': year, 'rows': count, 'file': target}
@@ -0,0 +1,118 @@
+"""Yearly archive files holding the ledger rows of closed years.
+
+``findash.accounts.archive_year`` moves every row of a closed year from
+``transactions`` into ``<db>.<year>.db``. That file has the same table,
+indexes and FTS index, and it is registered in ``archives``.
+``monthly_summary`` and ``balance_checkpoints`` keep the archived months, so
+the dashboard totals, balances and reconciliation never open the files.
+Readers that need individual rows pass their date range to
+``ledger_sources``, which ATTACHes only the archives that range reaches,
+for the duration of the query.
+
+Archived years are read-only. Writes dated in them are rejected, so no
+year is split between the hot table and an archive. A file that is not
+registered is ignored and overwritten by the next archival of its year.
+This covers an interrupted archival and the files left by ``clear_ledger``.
+"""
+import os
+from contextlib import contextmanager
+
+import pandas as pd
+
+ARCHIVES_DDL = """
+    CREATE TABLE IF NOT EXISTS archives (
+        year INTEGER PRIMARY KEY,
+        file TEXT NOT NULL,
+        rows INTEGER NOT NULL,
+        min_date TEXT NOT NULL,
+        max_date TEXT NOT NULL,
+        archived_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def main_file(conn) -> str:
+    for row in conn.execute("PRAGMA database_list"):
+        if row[1] == 'main':
+            return row[2]
+    return ''
+
+
+def archive_file(db_file: str, year: int) -> str:
+    return f"{os.path.splitext(db_file)[0]}.{int(year)}.db"
+
+
+def archived_month_sql(conn) -> str:
+    """Condition on a ``month`` (``YYYY-MM``) column matching the archived years."""
+    # Özet ve kontrol noktası göçleri arşiv tablosundan önce çalışır; o sırada arşiv yoktur
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'archives'").fetchone():
+        return "0"
+    return "CAST(substr(month, 1, 4) AS INTEGER) IN (SELECT year FROM archives)"
+
+
+def list_archives(conn) -> list:
+    return [dict(r) for r in conn.execute("SELECT year, file, rows, min_date, max_date, archived_at FROM archives ORDER BY year")]
+
+
+def archives_between(conn, min_date=None, max_date=None) -> list:
+    """Registered archives whose year overlaps ``[min_date, max_date]``, newest first; open ends are unbounded."""
+    first = pd.to_datetime(min_date).year if min_date is not None else 0
+    last = pd.to_datetime(max_date).year if max_date is not None else 9999
+    return [dict(r) for r in conn.execute(
+        "SELECT year, file, min_date, max_date FROM archives WHERE year BETWEEN ? AND ? ORDER BY year DESC", (first, last)
+    )]
+
+
+def ensure_open(conn, years):
+    """Rejects a write dated in an archived (closed) year."""
+    years = sorted({int(y) for y in years})
+    if not years:
+        return
+    closed = [r[0] for r in conn.execute(
+        f"SELECT year FROM archives WHERE year IN ({', '.join('?' * len(years))})", years
+    )]
+    if closed:
+        raise ValueError(f"{', '.join(map(str, closed))} yılı arşivlendi; arşivlenmiş yıllara işlem yazılamaz.")
+
+
+@contextmanager
+def attached(conn, archives):
+    """ATTACHes ``archives`` to ``conn`` inside the block; yields their schema names.
+
+    Must run outside a transaction. Archives the connection already has
+    attached (an enclosing block) are reused and left attached.
+    """
+    present = {row[1] for row in conn.execute("PRAGMA database_list")} if archives else set()
+    base = os.path.dirname(main_file(conn)) if archives else ''
+    names, added = [], []
+    try:
+        for archive in archives:
+            name = f"archive_{archive['year']}"
+            if name not in present:
+                target = os.path.join(base, archive['file'])
+                # Eksik dosyayı ATTACH boş bir veritabanı olarak yaratırdı
+                if not os.path.exists(target):
+                    raise FileNotFoundError(f"Arşiv dosyası bulunamadı: {target}")
+                conn.execute(f"ATTACH DATABASE ? AS {name}", (target,))
+                added.append(name)
+            names.append(name)
+        yield names
+    finally:
+        for name in added:
+            conn.execute(f"DETACH DATABASE {name}")
+
+
+@contextmanager
+def ledger_sources(conn, min_date=None, max_date=None):
+    """Yields the schemas holding ledger rows in the date range: ``main`` first, then the archives it reaches."""
+    with attached(conn, archives_between(conn, min_date, max_date)) as names:
+        yield ['main', *names]
+
+
+def union_all(select: str, schemas) -> str:
+    """``select``, written against ``{transactions}``, repeated over ``schemas`` and joined with UNION ALL.
+
+    Each part is wrapped in its own sub-select, so it may carry its own
+    ORDER BY and LIMIT; callers repeat their parameters once per schema.
+    """
+    return " UNION ALL ".join(f"SELECT * FROM ({select.format(transactions=f'{s}.transactions')})" for s in schemas)
@@ -0,0 +1,185 @@
+"""Pluggable query backends for the dashboard aggregations.
+
+``LedgerStore`` asks its backend for the monthly summary (month x type x
+category x payment method totals and counts) and the top-N expenses; the
+dashboard's period, type and category views are derived from those.
+
+``sqlite`` (the default) reads ``monthly_summary``, which the writers keep
+current, and runs indexed LIMIT queries. ``pandas`` and ``duckdb`` compute
+both from the rows of the in-memory compact ledger, which is memory-mapped
+from the columnar snapshot (``findash.snapshot``): ``pandas`` with
+group-bys, ``duckdb`` as vectorized SQL in an embedded DuckDB. DuckDB is
+handed the columns it needs as a no-copy view of the cached arrays (it
+cannot scan the ``period`` column) and reads them in place. Archived years (``findash.archive``) are not in that frame;
+their months come from ``monthly_summary`` and their top expenses from
+SQLite. ``duckdb`` needs the optional ``duckdb`` package.
+
+The backend is chosen with ``FINDASH_QUERY_BACKEND`` or per store;
+``register_backend`` adds others.
+"""
+import os
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from findash import archive, db, metrics
+from findash.compact import MINOR_UNITS
+from findash.summary import load_summary, load_top_expenses
+
+QUERY_BACKEND = os.getenv("FINDASH_QUERY_BACKEND", "sqlite")
+SUMMARY_COLUMNS = ['month', 'type', 'category', 'payment_method', 'total', 'count']
+LEDGER_COLUMNS = ('date', 'type', 'category', 'amount_minor', 'payment_method')
+
+
+class QueryBackend(ABC):
+    """Aggregations over the ledger of one ``LedgerStore``."""
+
+    name = None
+
+    def __init__(self, store):
+        self.store = store
+
+    @abstractmethod
+    def monthly_summary(self) -> pd.DataFrame:
+        """``SUMMARY_COLUMNS`` rows, one per month x type x category x payment method."""
+
+    @abstractmethod
+    def top_expenses(self, month: str = None, limit: int = 5) -> pd.DataFrame:
+        """``category`` and ``amount`` of the largest expenses, optionally within one ``YYYY-MM`` month."""
+
+
+class SQLiteBackend(QueryBackend):
+    name = 'sqlite'
+
+    def monthly_summary(self) -> pd.DataFrame:
+        with db.connection(self.store.path) as conn:
+            return load_summary(conn)
+
+    def top_expenses(self, month: str = None, limit: int = 5) -> pd.DataFrame:
+        with db.connection(self.store.path) as conn:
+            return load_top_expenses(conn, month, limit)
+
+
+class LedgerFrameBackend(QueryBackend):
+    """Base of the backends that aggregate the in-memory ledger rows."""
+
+    def monthly_summary(self) -> pd.DataFrame:
+        with db.connection(self.store.path) as conn:
+            archived = pd.read_sql_query(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM monthly_summary WHERE {archive.archived_month_sql(conn)}", conn
+            )
+        hot = self.aggregate_months(self.store.ledger.transactions)
+        return pd.concat([f for f in (hot, archived) if not f.empty] or [hot], ignore_index=True)
+
+    def top_expenses(self, month: str = None, limit: int = 5) -> pd.DataFrame:
+        with db.connection(self.store.path) as conn:
+            start = pd.Timestamp(f"{month}-01") if month else None
+            if archive.archives_between(conn, start, start):
+                # Arşivlenmiş yılların satırları bellekte değil; SQLite arşivleri bağlar
+                return load_top_expenses(conn, month, limit)
+        return self.largest_expenses(self.store.ledger.transactions, month, limit)
+
+    @abstractmethod
+    def aggregate_months(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """``SUMMARY_COLUMNS`` rows computed from the compact ledger ``frame``."""
+
+    @abstractmethod
+    def largest_expenses(self, frame: pd.DataFrame, month: str, limit: int) -> pd.DataFrame:
+        """``top_expenses`` computed from the compact ledger ``frame``."""
+
+
+class PandasBackend(LedgerFrameBackend):
+    name = 'pandas'
+
+    @metrics.instrumented('pandas.aggregate_months')
+    def aggregate_months(self, frame: pd.DataFrame) -> pd.DataFrame:
+        keys = [frame['period'], frame['type'], frame['category'], frame['payment_method']]
+        grouped = frame['amount_minor'].groupby(keys, observed=True, dropna=False).agg(['sum', 'size'])
+        out = grouped.reset_index()
+        out.columns = SUMMARY_COLUMNS
+        out['month'] = out['month'].dt.strftime('%Y-%m')
+        for col in ('type', 'category', 'payment_method'):
+            out[col] = out[col].astype('str').where(out[col].notna(), '')
+        out['total'] = out['total'] / MINOR_UNITS
+        return out
+
+    @metrics.instrumented('pandas.largest_expenses')
+    def largest_expenses(self, frame: pd.DataFrame, month: str, limit: int) -> pd.DataFrame:
+        mask = frame['type'] == 'Expense'
+        if month:
+            mask &= frame['period'] == pd.Period(month, 'M')
+        top = frame.loc[mask, ['category', 'amount_minor']].nlargest(limit, 'amount_minor')
+        return pd.DataFrame({'category': top['category'].astype('str').to_numpy(),
+                             'amount': (top['amount_minor'] / MINOR_UNITS).to_numpy()})
+
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("DuckDB sorgu arka ucu için 'duckdb' paketi gerekli.") from e
+    return duckdb
+
+
+DUCKDB_MONTHS_SQL = f"""
+    SELECT strftime(date, '%Y-%m') AS month,
+           COALESCE(CAST(type AS VARCHAR), '') AS type,
+           COALESCE(CAST(category AS VARCHAR), '') AS category,
+           COALESCE(CAST(payment_method AS VARCHAR), '') AS payment_method,
+           SUM(amount_minor) / {MINOR_UNITS} AS total,
+           COUNT(*) AS count
+    FROM ledger
+    GROUP BY ALL
+"""
+
+DUCKDB_TOP_SQL = f"""
+    SELECT CAST(category AS VARCHAR) AS category, amount_minor / {MINOR_UNITS} AS amount
+    FROM ledger
+    WHERE type = 'Expense' {{month}}
+    ORDER BY amount_minor DESC
+    LIMIT ?
+"""
+
+
+class DuckDBBackend(LedgerFrameBackend):
+    name = 'duckdb'
+
+    def __init__(self, store):
+        super().__init__(store)
+        self._db = _duckdb().connect()
+
+    def _query(self, frame: pd.DataFrame, sql: str, params=()) -> pd.DataFrame:
+        # Her çağrı kendi imlecini kullanır; oturum iş parçacıkları bağlantıyı paylaşmaz.
+        # Dönem sütununun DuckDB karşılığı yok; aylar tarihten hesaplanır. frame[[...]] sütunları
+        # kopyalardı; copy=False ile kayıtlı tablo önbellekteki dizileri doğrudan kullanır.
+        view = pd.DataFrame({col: frame[col] for col in LEDGER_COLUMNS}, copy=False)
+        cursor = self._db.cursor()
+        try:
+            cursor.register('ledger', view)
+            return cursor.execute(sql, list(params)).df()
+        finally:
+            cursor.close()
+
+    @metrics.instrumented('duckdb.aggregate_months')
+    def aggregate_months(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return self._query(frame, DUCKDB_MONTHS_SQL)
+
+    @metrics.instrumented('duckdb.largest_expenses')
+    def largest_expenses(self, frame: pd.DataFrame, month: str, limit: int) -> pd.DataFrame:
+        if month:
+            return self._query(frame, DUCKDB_TOP_SQL.format(month="AND strftime(date, '%Y-%m') = ?"), (month, limit))
+        return self._query(frame, DUCKDB_TOP_SQL.format(month=''), (limit,))
+
+
+BACKENDS = {backend.name: backend for backend in (SQLiteBackend, PandasBackend, DuckDBBackend)}
+
+
+def register_backend(backend: type):
+    BACKENDS[backend.name] = backend
+
+
+def make_backend(store, name: str = None) -> QueryBackend:
+    name = name or QUERY_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown query backend: {name} (choices: {', '.join(BACKENDS)})")
+    return BACKENDS[name](store)
@@ -0,0 +1,255 @@
+"""Balance reconciliation and monthly per-account balance checkpoints.
+
+An account's balance is its ``opening_balance`` plus the signed sum of its
+ledger rows (Income adds, Expense subtracts), matched on ``payment_method``.
+``balance_checkpoints`` stores that signed sum cumulated through the end of
+every month per payment method. Writers shift it inside the same SQL
+transaction as the ledger row, so the balance as of any date is one primary
+key lookup plus the rows of a single month read via the payment-method
+index, instead of a replay of the whole history. Archived years
+(``findash.archive``) count through their rows in ``monthly_summary``.
+
+The per-account ledger pages (``load_account_page``) and monthly totals
+(``account_monthly_totals``) compute their running balances with SQL
+window functions, anchored on the checkpoints rather than on a replay.
+"""
+import pandas as pd
+
+from findash import archive, metrics
+
+CHECKPOINTS_DDL = """
+    CREATE TABLE IF NOT EXISTS balance_checkpoints (
+        payment_method TEXT NOT NULL,
+        month TEXT NOT NULL,
+        cumulative REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (payment_method, month)
+    )
+"""
+
+SIGNED_AMOUNT_SQL = "CASE WHEN type = 'Income' THEN amount ELSE -amount END"
+ACCOUNT_PAGE_SIZE = 50
+
+# Sayfa satırları en yeniden eskiye sıralıdır; her satırın bakiyesi, sayfanın
+# en yeni satırından sonraki bakiyeden (çapa) kendinden yeni satırlar düşülerek bulunur
+ACCOUNT_PAGE_SQL = f"""
+    SELECT *, ? - COALESCE(SUM({SIGNED_AMOUNT_SQL}) OVER (
+        ORDER BY date DESC, id DESC ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0) AS balance
+    FROM ({{rows}})
+    ORDER BY date DESC, id DESC
+    LIMIT ?
+"""
+
+ACCOUNT_MONTHS_SQL = """
+    SELECT month, income, expense, income - expense AS net,
+           ? + SUM(income - expense) OVER (ORDER BY month ROWS UNBOUNDED PRECEDING) AS closing_balance
+    FROM (
+        SELECT month,
+               SUM(CASE WHEN type = 'Income' THEN total ELSE 0 END) AS income,
+               SUM(CASE WHEN type = 'Income' THEN 0 ELSE total END) AS expense
+        FROM monthly_summary
+        WHERE payment_method = ?
+        GROUP BY month
+    )
+    ORDER BY month DESC
+"""
+
+
+def _signed(frame: pd.DataFrame) -> pd.Series:
+    amount = frame['amount'].astype(float)
+    return amount.where(frame['type'] == 'Income', -amount)
+
+
+def _next_day(at) -> str:
+    return (pd.to_datetime(at).normalize() + pd.Timedelta(days=1)).isoformat()
+
+
+def _opening_balance(conn, payment_method: str) -> float:
+    row = conn.execute("SELECT opening_balance FROM bank_accounts WHERE name = ?", (payment_method,)).fetchone()
+    return float(row[0] or 0) if row else 0.0
+
+
+def shift_checkpoints(conn, payment_method: str, month: str, delta: float):
+    """Adds ``delta`` to the checkpoint of ``month`` and of every later month."""
+    payment_method = payment_method or ''
+    # Ay için ilk kayıt önceki ayın kümülatif değeriyle açılır
+    conn.execute(
+        """
+        INSERT INTO balance_checkpoints(payment_method, month, cumulative)
+        VALUES (?, ?, COALESCE((SELECT cumulative FROM balance_checkpoints
+                                WHERE payment_method = ? AND month < ? ORDER BY month DESC LIMIT 1), 0))
+        ON CONFLICT(payment_method, month) DO NOTHING
+        """,
+        (payment_method, month, payment_method, month),
+    )
+    conn.execute(
+        "UPDATE balance_checkpoints SET cumulative = cumulative + ? WHERE payment_method = ? AND month >= ?",
+        (float(delta), payment_method, month),
+    )
+
+
+def apply_checkpoint_delta(conn, date_iso, t_type, payment_method, amount, sign: int = 1):
+    """Adds (``sign=1``) or removes (``sign=-1``) one ledger row from the checkpoints."""
+    signed = float(amount) if t_type == 'Income' else -float(amount)
+    shift_checkpoints(conn, payment_method, str(date_iso)[:7], sign * signed)
+
+
+def load_ledger_deltas(conn) -> pd.DataFrame:
+    # Arşivlenmiş yıllar satır satır değil, aylık özet toplamlarıyla gelir; toplamlar için fark etmez
+    return pd.read_sql_query(
+        "SELECT COALESCE(payment_method, '') AS payment_method, substr(date, 1, 7) AS month, type, amount FROM transactions"
+        f" UNION ALL SELECT payment_method, month, type, total FROM monthly_summary WHERE {archive.archived_month_sql(conn)}",
+        conn,
+    )
+
+
+def rebuild_checkpoints(conn, ledger: pd.DataFrame = None):
+    """Recomputes every checkpoint with one grouped sum and a per-account cumulative sum."""
+    ledger = load_ledger_deltas(conn) if ledger is None else ledger
+    monthly = _signed(ledger).groupby([ledger['payment_method'], ledger['month']]).sum()
+    cumulative = monthly.groupby(level=0).cumsum()
+    conn.execute("DELETE FROM balance_checkpoints")
+    conn.executemany(
+        "INSERT INTO balance_checkpoints(payment_method, month, cumulative) VALUES (?, ?, ?)",
+        [(pm, month, float(total)) for (pm, month), total in cumulative.items()],
+    )
+
+
+def backfill_opening_balances(conn):
+    """Derives missing opening balances from the current balance minus the ledger."""
+    conn.execute(
+        f"""
+        UPDATE bank_accounts SET opening_balance = balance - COALESCE(
+            (SELECT SUM({SIGNED_AMOUNT_SQL}) FROM transactions WHERE payment_method = bank_accounts.name), 0)
+        WHERE opening_balance IS NULL
+        """
+    )
+
+
+@metrics.instrumented()
+def reconcile(conn, ledger: pd.DataFrame = None) -> pd.DataFrame:
+    """Stored vs. ledger-derived balance of every account, from one grouped pass over ``transactions``.
+
+    Returns ``id``, ``name``, ``balance`` (stored), ``expected`` and ``difference``.
+    """
+    ledger = load_ledger_deltas(conn) if ledger is None else ledger
+    totals = _signed(ledger).groupby(ledger['payment_method']).sum()
+    accounts = pd.read_sql_query("SELECT id, name, balance, COALESCE(opening_balance, 0) AS opening_balance FROM bank_accounts", conn)
+    accounts['expected'] = (accounts['opening_balance'] + accounts['name'].map(totals).fillna(0.0)).round(2)
+    accounts['difference'] = (accounts['balance'] - accounts['expected']).round(2) + 0.0  # -0.0 yerine 0.0
+    return accounts[['id', 'name', 'balance', 'expected', 'difference']]
+
+
+def rebuild_balances(conn) -> pd.DataFrame:
+    """Rewrites drifted balances and all checkpoints from the ledger; returns the reconciliation report."""
+    ledger = load_ledger_deltas(conn)
+    report = reconcile(conn, ledger)
+    drifted = report[report['difference'] != 0]
+    conn.executemany("UPDATE bank_accounts SET balance = ? WHERE id = ?",
+                     zip(drifted['expected'].astype(float).tolist(), drifted['id'].astype(int).tolist()))
+    rebuild_checkpoints(conn, ledger)
+    return report
+
+
+@metrics.instrumented()
+def balance_as_of(conn, payment_method: str, at) -> float:
+    """Balance of an account at the end of day ``at``."""
+    month = pd.to_datetime(at).strftime('%Y-%m')
+    month_rows = (f"SELECT {SIGNED_AMOUNT_SQL} AS amount FROM {{transactions}}"
+                  " WHERE payment_method = ? AND date >= ? AND date < ?")
+    with archive.ledger_sources(conn, at, at) as schemas:
+        row = conn.execute(
+            f"""
+            SELECT
+                COALESCE((SELECT opening_balance FROM bank_accounts WHERE name = ?), 0),
+                COALESCE((SELECT cumulative FROM balance_checkpoints
+                          WHERE payment_method = ? AND month < ? ORDER BY month DESC LIMIT 1), 0),
+                COALESCE((SELECT SUM(amount) FROM ({archive.union_all(month_rows, schemas)})), 0)
+            """,
+            [payment_method, payment_method, month] + [payment_method, f"{month}-01", _next_day(at)] * len(schemas),
+        ).fetchone()
+    return float(row[0] + row[1] + row[2])
+
+
+@metrics.instrumented()
+def running_balance(conn, payment_method: str, min_date=None, max_date=None) -> pd.DataFrame:
+    """Ledger rows of one account in date order with the balance after each row."""
+    clauses, params = ["payment_method = ?"], [payment_method]
+    if min_date is not None:
+        clauses.append("date >= ?")
+        params.append(pd.to_datetime(min_date).normalize().isoformat())
+    if max_date is not None:
+        clauses.append("date < ?")
+        params.append(_next_day(max_date))
+    select = f"SELECT * FROM {{transactions}} WHERE {' AND '.join(clauses)}"
+    with archive.ledger_sources(conn, min_date, max_date) as schemas:
+        rows = pd.read_sql_query(
+            f"{archive.union_all(select, schemas)} ORDER BY date, id", conn, params=params * len(schemas)
+        )
+        if min_date is not None:
+            start = balance_as_of(conn, payment_method, pd.to_datetime(min_date) - pd.Timedelta(days=1))
+        else:
+            start = _opening_balance(conn, payment_method)
+    rows['balance'] = start + _signed(rows).cumsum()
+    return rows
+
+
+def _current_ledger_balance(conn, payment_method: str) -> float:
+    """Opening balance plus every ledger row of the account, from its latest checkpoint."""
+    row = conn.execute(
+        """
+        SELECT COALESCE((SELECT opening_balance FROM bank_accounts WHERE name = ?), 0),
+               COALESCE((SELECT cumulative FROM balance_checkpoints
+                         WHERE payment_method = ? ORDER BY month DESC LIMIT 1), 0)
+        """,
+        (payment_method, payment_method),
+    ).fetchone()
+    return float(row[0] + row[1])
+
+
+def _read_account_page(conn, schemas, payment_method: str, cursor, anchor: float, limit: int) -> pd.DataFrame:
+    clauses, params = ["payment_method = ?"], [payment_method]
+    if cursor:
+        clauses.append("(date, id) < (?, ?)")
+        params += list(cursor[:2])
+    select = f"SELECT * FROM {{transactions}} WHERE {' AND '.join(clauses)} ORDER BY date DESC, id DESC LIMIT ?"
+    return pd.read_sql_query(
+        ACCOUNT_PAGE_SQL.format(rows=archive.union_all(select, schemas)),
+        conn, params=[anchor] + (params + [limit + 1]) * len(schemas) + [limit + 1],
+    )
+
+
+@metrics.instrumented()
+def load_account_page(conn, payment_method: str, cursor=None, limit: int = ACCOUNT_PAGE_SIZE):
+    """One page of an account's ledger (newest first) with the balance after each row, and the next cursor.
+
+    Pages are keyset-paginated on ``(date, id)`` over the payment-method
+    index; the cursor also carries the balance before the page, so a page
+    costs one indexed range scan of ``limit`` rows however long the history
+    is. The first page starts from the latest checkpoint. Archived years are
+    ATTACHed only once the open ledger cannot fill the page.
+    """
+    anchor = cursor[2] if cursor else _current_ledger_balance(conn, payment_method)
+    df = _read_account_page(conn, ['main'], payment_method, cursor, anchor, limit)
+    if len(df) <= limit:
+        with archive.ledger_sources(conn, None, cursor[0] if cursor else None) as schemas:
+            if len(schemas) > 1:
+                df = _read_account_page(conn, schemas, payment_method, cursor, anchor, limit)
+    next_cursor = None
+    if len(df) > limit:
+        df = df.iloc[:limit]
+        last = df.iloc[-1]
+        before = last['balance'] - (last['amount'] if last['type'] == 'Income' else -last['amount'])
+        next_cursor = (last['date'], int(last['id']), float(before))
+    df['date'] = pd.to_datetime(df['date'])
+    return df, next_cursor
+
+
+@metrics.instrumented()
+def account_monthly_totals(conn, payment_method: str) -> pd.DataFrame:
+    """Income, expense, net and closing balance of an account per month, newest first.
+
+    Reads ``monthly_summary``, so archived years are included without
+    attaching them.
+    """
+    opening = _opening_balance(conn, payment_method)
+    return pd.read_sql_query(ACCOUNT_MONTHS_SQL, conn, params=(opening, payment_method))
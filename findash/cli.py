@@ -0,0 +1,201 @@
+"""Command-line entry point for batch jobs: ``python -m findash <command>``.
+
+Usage:
+
+    python -m findash --db findash.db init
+    python -m findash import-csv ekstre.csv --account "Ziraat Bankası" --map date=Tarih amount=Tutar --dayfirst
+    python -m findash import-ofx ekstre.ofx --account "Bonus Kredi Kartı"
+    python -m findash import-rates kurlar.csv
+    python -m findash export islemler.parquet --format parquet --from 2025-01-01
+    python -m findash generate --rows 100000 --seed 7
+    python -m findash reconcile --fix
+    python -m findash summary --month 2025-06 --backend duckdb
+    python -m findash snapshot
+    python -m findash archive 2022 2023
+    python -m findash accounts
+
+``--db`` defaults to ``DATABASE_URL`` / ``findash.db`` like the app. Every
+command runs ``init_db`` first. Engine modules are imported only after the
+arguments are parsed, so ``--help`` and argument errors stay fast.
+"""
+import argparse
+import json
+import os
+import sys
+
+
+def _mapping(pairs) -> dict:
+    mapping = {}
+    for pair in pairs or ():
+        field, sep, column = pair.partition('=')
+        if not sep:
+            raise SystemExit(f"--map expects field=column, got {pair!r}")
+        mapping[field] = column
+    return mapping
+
+
+def cmd_init(args, engine):
+    print(f"ready: {args.db or engine.DB_PATH}")
+
+
+def cmd_import_csv(args, engine):
+    mapping = _mapping(args.map) or {'date': 'date', 'amount': 'amount', 'description': 'description'}
+    result = engine.import_csv(args.file, mapping, args.account, args.category, dayfirst=args.dayfirst,
+                               decimal=args.decimal, date_format=args.date_format, sep=args.sep, path=args.db)
+    print(json.dumps(result))
+
+
+def cmd_import_ofx(args, engine):
+    result = engine.import_ofx(args.file, args.account, args.category, encoding=args.encoding, path=args.db)
+    print(json.dumps(result))
+
+
+def cmd_import_rates(args, engine):
+    print(json.dumps({'rows': engine.import_rates(args.file, path=args.db)}))
+
+
+def cmd_export(args, engine):
+    filters = {'t_type': args.type, 'min_date': args.date_from, 'max_date': args.date_to,
+               'category': args.category, 'search': args.search}
+    filters = {k: v for k, v in filters.items() if v} if args.table == 'transactions' else None
+    written = engine.export_to_file(args.output, args.format, args.table, filters, path=args.db)
+    print(json.dumps({'bytes': written, 'output': args.output}))
+
+
+def cmd_generate(args, engine):
+    def generate(conn):
+        if args.replace:
+            engine.clear_ledger(conn)
+        return engine.write_synthetic(conn, args.rows, seed=args.seed, accounts=args.accounts, days=args.days)
+    print(json.dumps(engine.write(generate, path=args.db)))
+
+
+def cmd_reconcile(args, engine):
+    if args.fix:
+        def rebuild(conn):
+            report = engine.rebuild_balances(conn)
+            engine.bump_version(conn, engine.ACCOUNTS_VERSION_KEY)
+            return report
+        report = engine.write(rebuild, path=args.db)
+    else:
+        with engine.connection(args.db) as conn:
+            report = engine.reconcile(conn)
+    print(report.to_string(index=False))
+    drift = int((report['difference'] != 0).sum())
+    return 1 if drift and not args.fix else 0
+
+
+def cmd_summary(args, engine):
+    store = engine.LedgerStore(args.db, backend=args.backend)
+    store.sync()
+    summary = store.monthly_summary()
+    if args.month:
+        summary = summary[summary['month'] == args.month]
+    table = summary.pivot_table(index='month', columns='type', values='total_base', aggfunc='sum', fill_value=0.0)
+    print(table.round(2).to_string())
+
+
+def cmd_snapshot(args, engine):
+    cache = engine.LedgerCache(args.db)
+    cache.reload(save_snapshot=True)
+    target = engine.snapshot_path(args.db)
+    size = os.path.getsize(target) if os.path.exists(target) else 0
+    print(json.dumps({'rows': len(cache.transactions), 'version': cache.version, 'bytes': size, 'output': target}))
+
+
+def cmd_archive(args, engine):
+    for year in args.years:
+        print(json.dumps(engine.write(engine.archive_year, year, path=args.db)))
+    with engine.connection(args.db) as conn:
+        for archive in engine.list_archives(conn):
+            print(f"{archive['year']}  {archive['rows']:>10,}  {archive['min_date'][:10]} .. {archive['max_date'][:10]}  {archive['file']}")
+
+
+def cmd_accounts(args, engine):
+    with engine.connection(args.db) as conn:
+        for acc in engine.load_accounts(conn):
+            print(f"{acc['id']:>5}  {acc['name']:<30}{acc['balance']:>15,.2f} {acc['currency']}  {acc['account_type']}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m findash', description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help="SQLite file (default: DATABASE_URL or findash.db)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('init', help="create or migrate the schema").set_defaults(run=cmd_init)
+
+    p = commands.add_parser('import-csv', help="bulk import a CSV statement")
+    p.add_argument('file')
+    p.add_argument('--account', help="payment method for every row")
+    p.add_argument('--category', help="category when the file has none")
+    p.add_argument('--map', nargs='+', metavar='FIELD=COLUMN',
+                   help="date, amount, description, category, type, payment_method")
+    p.add_argument('--dayfirst', action='store_true')
+    p.add_argument('--decimal', default='.')
+    p.add_argument('--sep', default=',')
+    p.add_argument('--date-format')
+    p.set_defaults(run=cmd_import_csv)
+
+    p = commands.add_parser('import-ofx', help="bulk import an OFX/QFX statement")
+    p.add_argument('file')
+    p.add_argument('--account', required=True)
+    p.add_argument('--category')
+    p.add_argument('--encoding', default='utf-8')
+    p.set_defaults(run=cmd_import_ofx)
+
+    p = commands.add_parser('import-rates', help="load daily exchange rates (date, currency, rate)")
+    p.add_argument('file')
+    p.set_defaults(run=cmd_import_rates)
+
+    p = commands.add_parser('export', help="stream a table to CSV or Parquet")
+    p.add_argument('output')
+    p.add_argument('--table', default='transactions', choices=('transactions', 'bank_accounts'))
+    p.add_argument('--format', default='csv', choices=('csv', 'parquet'))
+    p.add_argument('--type', choices=('Income', 'Expense'))
+    p.add_argument('--from', dest='date_from')
+    p.add_argument('--to', dest='date_to')
+    p.add_argument('--category')
+    p.add_argument('--search')
+    p.set_defaults(run=cmd_export)
+
+    p = commands.add_parser('generate', help="add a synthetic ledger")
+    p.add_argument('--rows', type=int, default=10_000)
+    p.add_argument('--seed', type=int, default=42)
+    p.add_argument('--accounts', type=int, default=6)
+    p.add_argument('--days', type=int, default=365)
+    p.add_argument('--replace', action='store_true', help="delete existing data first")
+    p.set_defaults(run=cmd_generate)
+
+    p = commands.add_parser('reconcile', help="compare balances with the ledger (exit 1 on drift)")
+    p.add_argument('--fix', action='store_true', help="rebuild balances and checkpoints from the ledger")
+    p.set_defaults(run=cmd_reconcile)
+
+    p = commands.add_parser('summary', help="income and expense per month in the base currency")
+    p.add_argument('--month', help="YYYY-MM")
+    p.add_argument('--backend', help="query backend: sqlite, pandas or duckdb (default: FINDASH_QUERY_BACKEND or sqlite)")
+    p.set_defaults(run=cmd_summary)
+
+    commands.add_parser('snapshot', help="write the columnar ledger snapshot (needs pyarrow)").set_defaults(run=cmd_snapshot)
+
+    p = commands.add_parser('archive', help="move closed years into yearly archive files and list them")
+    p.add_argument('years', nargs='*', type=int)
+    p.set_defaults(run=cmd_archive)
+
+    commands.add_parser('accounts', help="list accounts and balances").set_defaults(run=cmd_accounts)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    from findash import engine
+
+    engine.init_db(args.db)
+    try:
+        return args.run(args, engine) or 0
+    finally:
+        engine.close_writers()
+        engine.close_pools()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Compact columnar in-memory representation of the ledger.
+
+``read_sql_query`` returns ``type``, ``category`` and ``payment_method`` as
+full string columns (Python objects before pandas 3) and amounts as floats.
+The compact frame
+stores the low-cardinality text columns as categoricals, ids as int64,
+amounts as int64 minor units (kuruş, so sums are exact) and a precomputed
+monthly ``period`` column, which is what the grouped views key on.
+Descriptions become categorical too when they repeat enough to pay off
+(imported statements and the demo data mostly do).
+"""
+import numpy as np
+import pandas as pd
+
+MINOR_UNITS = 100
+CATEGORICAL_COLUMNS = ('type', 'category', 'payment_method')
+CHUNK_SIZE = 250_000
+# Benzersiz değer oranı bunun altındaysa açıklamalar kategorik tutulur
+CATEGORICAL_TEXT_RATIO = 0.5
+
+
+def to_minor(amount) -> np.ndarray:
+    return np.rint(np.asarray(amount, dtype=float) * MINOR_UNITS).astype(np.int64)
+
+
+def from_minor(amount_minor) -> pd.Series:
+    """Minor units back to a float amount, e.g. for display."""
+    return pd.Series(amount_minor, dtype='int64') / MINOR_UNITS
+
+
+def _text_column(values: pd.Series) -> pd.Series:
+    if len(values) and values.nunique(dropna=False) <= CATEGORICAL_TEXT_RATIO * len(values):
+        return values.astype('category')
+    # astype('str') yazardı: pandas 3 öncesinde NULL açıklamalar 'None' metnine dönüşür
+    return values.map(str, na_action='ignore')
+
+
+def compact_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Converts rows shaped like the ``transactions`` table into the compact layout."""
+    dates = pd.to_datetime(frame['date'], format='ISO8601')
+    out = pd.DataFrame({
+        'id': frame['id'].astype('int64'),
+        'date': dates,
+        'period': dates.dt.to_period('M'),
+        'type': frame['type'].astype('category'),
+        'category': frame['category'].astype('category'),
+        'amount_minor': to_minor(frame['amount']),
+        'description': _text_column(frame['description']),
+        'payment_method': frame['payment_method'].astype('category'),
+    }, index=frame.index)
+    return out
+
+
+def concat_compact(frames) -> pd.DataFrame:
+    """Concatenates compact frames, unifying categories so the columns stay categorical."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return compact_frame(pd.DataFrame(columns=['id', 'date', 'type', 'category', 'amount', 'description', 'payment_method']))
+    if len(frames) == 1:
+        return frames[0]
+    frames = [f.copy() for f in frames]
+    categorical = CATEGORICAL_COLUMNS
+    if any(f['description'].dtype == 'category' for f in frames):
+        # Tek satırlık eklemeler tüm açıklama sütununu metne döndürmesin
+        for f in frames:
+            f['description'] = f['description'].astype('category')
+        categorical += ('description',)
+    for col in categorical:
+        categories = pd.api.types.union_categoricals([f[col] for f in frames]).categories
+        for f in frames:
+            f[col] = f[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_compact(conn, sql: str, params=(), chunksize: int = CHUNK_SIZE) -> pd.DataFrame:
+    """Runs ``sql`` and converts the result chunk by chunk.
+
+    Only one chunk exists in the wide object form at a time, so peak memory
+    stays close to the size of the compact result.
+    """
+    return concat_compact(compact_frame(chunk) for chunk in pd.read_sql_query(sql, conn, params=params, chunksize=chunksize))
+
+
+def memory_bytes(frame: pd.DataFrame) -> int:
+    return int(frame.memory_usage(deep=True).sum())
@@ -0,0 +1,190 @@
+"""SQLite connection management shared by every storage helper.
+
+Connections are long-lived and pooled per database file so that a single
+UI action no longer pays for several ``sqlite3.connect`` calls. Every pooled
+connection is opened in WAL mode with tuned pragmas, and relies on the
+sqlite3 module's per-connection statement cache to reuse prepared statements.
+Statements and fetched rows are counted into the active ``findash.metrics``
+run, if any.
+"""
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from findash import metrics
+
+DB_PATH = os.getenv(
+    "DATABASE_URL",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'findash.db'),
+)
+
+POOL_SIZE = 8
+STATEMENT_CACHE_SIZE = 256
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -20000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports executed statements and fetched rows to ``findash.metrics``."""
+
+    def execute(self, sql, parameters=()):
+        metrics.count_query()
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        metrics.count_query()
+        return super().executemany(sql, seq_of_parameters)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            metrics.count_rows(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        metrics.count_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        metrics.count_rows(len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        metrics.count_rows(1)
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """``Connection.execute`` bypasses ``cursor()``, so both are routed through ``InstrumentedCursor``."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def open_connection(path: str = None) -> sqlite3.Connection:
+    """Opens a tuned connection. Transactions are controlled explicitly."""
+    conn = sqlite3.connect(
+        path or DB_PATH,
+        isolation_level=None,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        factory=InstrumentedConnection,
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """LIFO pool of connections to one database file."""
+
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                return open_connection(self.path)
+        return self._idle.get()
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put_nowait(conn)
+
+    def close(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._opened = 0
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path: str = None) -> ConnectionPool:
+    path = path or DB_PATH
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(path, ConnectionPool(path))
+    return pool
+
+
+def close_pools():
+    """Closes every idle pooled connection (used by benchmarks and shutdown)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def _reset_after_fork():
+    # Ebeveynden gelen bağlantılar çocuk süreçte kullanılamaz; kapatmadan bırakılır
+    global _pools, _pools_lock
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@contextmanager
+def connection(path: str = None):
+    """Borrows a pooled connection for reads."""
+    pool = get_pool(path)
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+@contextmanager
+def transaction(path: str = None):
+    """Borrows a pooled connection inside a single write transaction.
+
+    ``BEGIN IMMEDIATE`` takes the write lock up front, so concurrent writers
+    wait on ``busy_timeout`` instead of failing with ``database is locked``
+    when a deferred transaction tries to upgrade.
+    """
+    with connection(path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
@@ -0,0 +1,50 @@
+"""Headless entry point to the storage and ledger operations.
+
+Batch jobs, worker processes and ``python -m findash`` use this module
+instead of ``app.py``; nothing in the ``findash`` package depends on
+Streamlit. Importing it takes milliseconds: each name below resolves to its
+module on first access, so pandas is only loaded by the helpers that need
+it. No table is created and no connection is opened until a function is
+called; run ``init_db`` once per database file before the first write.
+
+Writes go through the per-process writer thread (``findash.writer``), and
+pooled connections and writers are reset in forked children, so the engine
+can be used from ``multiprocessing`` workers.
+"""
+import importlib
+
+_EXPORTS = {
+    'findash.db': ('DB_PATH', 'connection', 'transaction', 'close_pools'),
+    'findash.schema': ('init_db',),
+    'findash.writer': ('submit', 'write', 'close_writers'),
+    'findash.transactions': ('adjust_account_balance', 'insert_row', 'update_row', 'delete_row',
+                             'insert_transaction', 'update_transaction', 'delete_transaction'),
+    'findash.accounts': ('load_accounts', 'insert_account', 'delete_account', 'clear_ledger', 'archive_year'),
+    'findash.archive': ('list_archives',),
+    'findash.ledger': ('ACCOUNTS_VERSION_KEY', 'LedgerCache', 'LedgerStore', 'bump_version', 'read_versions'),
+    'findash.snapshot': ('snapshot_path',),
+    'findash.backends': ('QueryBackend', 'make_backend', 'register_backend'),
+    'findash.queries': ('load_transactions_page',),
+    'findash.summary': ('load_summary', 'load_top_expenses', 'rebuild_summary'),
+    'findash.balances': ('reconcile', 'rebuild_balances', 'balance_as_of', 'running_balance',
+                         'load_account_page', 'account_monthly_totals'),
+    'findash.importer': ('import_csv', 'import_ofx', 'import_rates'),
+    'findash.exporter': ('export_to_file',),
+    'findash.generator': ('write_synthetic',),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
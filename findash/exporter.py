@@ -0,0 +1,147 @@
+"""Chunked export of the ledger and accounts to CSV or Parquet.
+
+Rows are pulled from SQLite with a cursor in fixed-size chunks and encoded
+one chunk at a time, so memory use depends on the chunk size and not on
+the size of the ledger. The ``iter_*`` generators yield encoded bytes as
+soon as each chunk is ready, which lets callers stream the download.
+Transaction exports include the archived years their date filters reach.
+Parquet output needs the optional ``pyarrow`` package.
+"""
+import io
+
+import pandas as pd
+
+from findash import archive, db
+from findash.queries import transaction_filter_sql
+
+CHUNK_SIZE = 50_000
+EXPORT_TABLES = ('transactions', 'bank_accounts')
+EXPORT_FORMATS = ('csv', 'parquet')
+
+
+def _transactions_sql(filters: dict, schemas):
+    parts, params = [], []
+    for schema in schemas:
+        clauses, schema_params = transaction_filter_sql(**filters, schema=schema)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        parts.append(f"SELECT * FROM {schema}.transactions {where}")
+        params += schema_params
+    return f"{' UNION ALL '.join(parts)} ORDER BY date, id", params
+
+
+def _read_chunks(conn, sql: str, params, chunksize: int):
+    # Tek okuma işlemi: dışa aktarım boyunca tutarlı bir anlık görüntü
+    conn.execute("BEGIN")
+    try:
+        yield from pd.read_sql_query(sql, conn, params=params, chunksize=chunksize)
+    finally:
+        conn.commit()
+
+
+def iter_chunks(table: str = 'transactions', filters: dict = None, chunksize: int = CHUNK_SIZE, path: str = None):
+    """Yields DataFrame chunks of ``table``; ``filters`` apply to transactions only."""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    filters = filters or {}
+    with db.connection(path) as conn:
+        if table != 'transactions':
+            yield from _read_chunks(conn, f"SELECT * FROM {table} ORDER BY id", [], chunksize)
+            return
+        # Arşivler okuma işlemi başlamadan bağlanır
+        with archive.ledger_sources(conn, filters.get('min_date'), filters.get('max_date')) as schemas:
+            sql, params = _transactions_sql(filters, schemas)
+            yield from _read_chunks(conn, sql, params, chunksize)
+
+
+def iter_csv_bytes(table: str = 'transactions', filters: dict = None, chunksize: int = CHUNK_SIZE, path: str = None):
+    header = True
+    for chunk in iter_chunks(table, filters, chunksize, path):
+        yield chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+    if header:
+        # Boş tablo: yalnızca başlık satırı
+        with db.connection(path) as conn:
+            columns = [r['name'] for r in conn.execute(f"PRAGMA table_info({table})")]
+        yield (','.join(columns) + '\n').encode('utf-8')
+
+
+class _DrainingSink(io.RawIOBase):
+    """Write-only file object whose buffered bytes can be taken out between row groups."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def iter_parquet_bytes(table: str = 'transactions', filters: dict = None, chunksize: int = CHUNK_SIZE, path: str = None):
+    """Yields a Parquet file one row group per chunk."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet dışa aktarımı için 'pyarrow' paketi gerekli.") from e
+
+    # Şema, parçalardan değil tablo tanımından gelir; tamamen boş bir sütun tip değiştirmez
+    arrow_types = {'TEXT': pa.string(), 'REAL': pa.float64(), 'INTEGER': pa.int64()}
+    with db.connection(path) as conn:
+        schema = pa.schema([(r['name'], arrow_types.get(r['type'].upper(), pa.string()))
+                            for r in conn.execute(f"PRAGMA table_info({table})")])
+
+    sink = _DrainingSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in iter_chunks(table, filters, chunksize, path):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def iter_export_bytes(fmt: str, table: str = 'transactions', filters: dict = None,
+                      chunksize: int = CHUNK_SIZE, path: str = None):
+    if fmt == 'csv':
+        return iter_csv_bytes(table, filters, chunksize, path)
+    if fmt == 'parquet':
+        return iter_parquet_bytes(table, filters, chunksize, path)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_to_file(target, fmt: str, table: str = 'transactions', filters: dict = None,
+                   chunksize: int = CHUNK_SIZE, path: str = None) -> int:
+    """Streams an export into a path or binary file object; returns bytes written."""
+    written = 0
+    out = open(target, 'wb') if isinstance(target, str) else target
+    try:
+        for data in iter_export_bytes(fmt, table, filters, chunksize, path):
+            out.write(data)
+            written += len(data)
+    finally:
+        if out is not target:
+            out.close()
+    return written
+
+
+def export_bytes(fmt: str, table: str = 'transactions', filters: dict = None, chunksize: int = CHUNK_SIZE,
+                 path: str = None) -> bytes:
+    """The whole export as one bytes object, for ``st.download_button``.
+
+    Held in memory in full; ``export_to_file`` is the memory-bounded path.
+    """
+    return b''.join(iter_export_bytes(fmt, table, filters, chunksize, path))
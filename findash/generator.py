@@ -0,0 +1,115 @@
+"""Deterministic synthetic ledger for demos and load tests.
+
+``write_synthetic`` creates a set of accounts and ``rows`` transactions
+spread over the last ``days`` days, generated with NumPy in batches and
+written with ``executemany``. Balances, monthly aggregates and checkpoints
+are derived once at the end. The same ``seed`` and arguments always
+produce the same rows; ``seed=None`` gives a fresh random ledger.
+"""
+import datetime
+import time
+
+import numpy as np
+import pandas as pd
+
+from findash import archive
+from findash.balances import rebuild_checkpoints
+from findash.ledger import ACCOUNTS_VERSION_KEY, bump_version
+from findash.search import deferred_indexing
+from findash.summary import rebuild_summary
+
+BATCH_SIZE = 100_000
+INCOME_SHARE = 0.3
+
+DEMO_ACCOUNTS = [
+    {'name': 'Ziraat Bankası', 'balance': 15400.50, 'currency': 'TRY', 'account_type': 'Banka'},
+    {'name': 'Garanti BBVA', 'balance': 4200.00, 'currency': 'TRY', 'account_type': 'Banka'},
+    {'name': 'İş Bankası', 'balance': 250.00, 'currency': 'USD', 'account_type': 'Banka'},
+    {'name': 'Bonus Kredi Kartı', 'balance': -1200.00, 'currency': 'TRY', 'account_type': 'Kredi Kartı'},
+    {'name': 'Cüzdan', 'balance': 500.00, 'currency': 'TRY', 'account_type': 'Nakit'},
+    {'name': 'Sodexo', 'balance': 450.00, 'currency': 'TRY', 'account_type': 'Yemek Kartı'},
+]
+ACCOUNT_TYPES = ('Banka', 'Kredi Kartı', 'Nakit', 'Yemek Kartı')
+
+MERCHANTS = {
+    'Maaş': ['Maaş Ödemesi', 'Prim', 'Serbest Çalışma'],
+    'Kira': ['Ev Kirası', 'Aidat'],
+    'Eğlence': ['Sinema', 'Konser Bileti', 'Netflix', 'Spotify'],
+    'Alışveriş': ['Trendyol', 'Hepsiburada', 'Amazon', 'Teknosa'],
+    'Kıyafet': ['LC Waikiki', 'Koton', 'Zara', 'DeFacto'],
+    'Yemek': ['Migros', 'BİM', 'A101', 'Yemeksepeti', 'Getir'],
+    'Sağlık': ['Eczane', 'Diş Hekimi', 'Hastane'],
+    'Seyahat': ['THY', 'Pegasus', 'Otobüs Bileti', 'Otel'],
+}
+EXPENSE_CATEGORIES = [c for c in MERCHANTS if c != 'Maaş']
+
+
+def make_accounts(count: int = len(DEMO_ACCOUNTS)) -> list:
+    """The demo accounts followed by numbered extra TRY accounts up to ``count``."""
+    accounts = [dict(a) for a in DEMO_ACCOUNTS[:count]]
+    for i in range(len(accounts), count):
+        accounts.append({'name': f'Hesap {i + 1}', 'balance': 1000.0, 'currency': 'TRY',
+                         'account_type': ACCOUNT_TYPES[i % len(ACCOUNT_TYPES)]})
+    return accounts
+
+
+def iter_batches(rows: int, payment_methods, seed=42, days: int = 365, end: datetime.date = None,
+                 batch_size: int = BATCH_SIZE):
+    """Yields ``transactions``-shaped DataFrames, oldest rows first."""
+    rng = np.random.default_rng(seed)
+    end = np.datetime64(end or datetime.date.today(), 'D')
+    payment_methods = np.asarray(payment_methods)
+    for offset in range(0, rows, batch_size):
+        n = min(batch_size, rows - offset)
+        # Satırlar gün sırasına göre üretilir; yazım indekslerde sıralı ilerler
+        day = (np.arange(offset, offset + n, dtype=np.int64) * days) // max(rows, 1)
+        dates = end - (days - 1) + day.astype('timedelta64[D]')
+        is_income = rng.random(n) < INCOME_SHARE
+        category = np.where(is_income, 'Maaş', rng.choice(EXPENSE_CATEGORIES, n)).astype(object)
+        amount = np.round(np.where(is_income, rng.uniform(500, 2500, n), rng.uniform(50, 400, n)), 2)
+        description = np.empty(n, dtype=object)
+        for cat, names in MERCHANTS.items():
+            mask = category == cat
+            description[mask] = rng.choice(names, int(mask.sum()))
+        yield pd.DataFrame({
+            'date': np.char.add(np.datetime_as_string(dates), 'T00:00:00'),
+            'type': np.where(is_income, 'Income', 'Expense'),
+            'category': category,
+            'amount': amount,
+            'description': description,
+            'payment_method': rng.choice(payment_methods, n),
+        })
+
+
+def write_synthetic(conn, rows: int, seed=42, accounts: int = len(DEMO_ACCOUNTS), days: int = 365,
+                    end: datetime.date = None, batch_size: int = BATCH_SIZE) -> dict:
+    """Adds synthetic accounts and transactions inside the caller's write transaction."""
+    start = time.perf_counter()
+    last = end or datetime.date.today()
+    archive.ensure_open(conn, range((last - datetime.timedelta(days=days - 1)).year, last.year + 1))
+    account_rows = make_accounts(accounts)
+    conn.executemany(
+        "INSERT INTO bank_accounts(name, balance, currency, account_type, opening_balance) VALUES (?, ?, ?, ?, ?)",
+        [(a['name'], a['balance'], a['currency'], a['account_type'], a['balance']) for a in account_rows],
+    )
+    # Döviz hesapları TL harcamalarıyla karışmasın
+    payment_methods = [a['name'] for a in account_rows if a['currency'] == 'TRY']
+
+    deltas = pd.Series(dtype=float)
+    with deferred_indexing(conn):
+        for batch in iter_batches(rows, payment_methods, seed, days, end, batch_size):
+            conn.executemany(
+                "INSERT INTO transactions(date, type, category, amount, description, payment_method) VALUES (?, ?, ?, ?, ?, ?)",
+                zip(batch['date'].tolist(), batch['type'].tolist(), batch['category'].tolist(), batch['amount'].tolist(),
+                    batch['description'].tolist(), batch['payment_method'].tolist()),
+            )
+            signed = batch['amount'].where(batch['type'] == 'Income', -batch['amount'])
+            deltas = deltas.add(signed.groupby(batch['payment_method']).sum(), fill_value=0.0)
+
+    conn.executemany("UPDATE bank_accounts SET balance = balance + ? WHERE name = ?",
+                     [(float(delta), pm) for pm, delta in deltas.items()])
+    rebuild_summary(conn)
+    rebuild_checkpoints(conn)
+    bump_version(conn)
+    bump_version(conn, ACCOUNTS_VERSION_KEY)
+    return {'rows': rows, 'accounts': len(account_rows), 'seconds': time.perf_counter() - start}
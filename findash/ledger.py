@@ -0,0 +1,236 @@
+"""In-memory ledger kept current by applying single-row deltas.
+
+Every write to ``transactions`` bumps ``meta.ledger_version`` in the same
+SQL transaction. A cache that is exactly one version behind can apply the
+written row without touching the rest of the history; any other gap means
+someone else wrote in between and the cache falls back to a full reload.
+Account writes (including balance changes) bump ``meta.accounts_version``
+and exchange-rate imports bump ``meta.rates_version``. Full reloads start
+from the columnar snapshot file (``findash.snapshot``) when it is usable.
+
+``LedgerStore`` bundles both caches so one instance can be shared by every
+session of the process. Its dashboard aggregations run on a pluggable
+query backend (``findash.backends``). Readers get the cached objects themselves, not
+copies, and must treat them as read-only.
+"""
+import threading
+
+import pandas as pd
+
+from findash import db, metrics, snapshot, writer
+from findash.backends import make_backend
+from findash.compact import compact_frame, concat_compact, read_compact
+from findash.rates import convert_by_account, load_rates
+
+LEDGER_VERSION_KEY = 'ledger_version'
+ACCOUNTS_VERSION_KEY = 'accounts_version'
+RATES_VERSION_KEY = 'rates_version'
+TRANSACTIONS_SQL = "SELECT * FROM transactions ORDER BY date DESC"
+
+
+def read_version(conn, key: str = LEDGER_VERSION_KEY) -> int:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else 0
+
+
+def read_versions(conn) -> dict:
+    return {r[0]: r[1] for r in conn.execute("SELECT key, value FROM meta")}
+
+
+def bump_version(conn, key: str = LEDGER_VERSION_KEY) -> int:
+    """Increments a version counter inside the caller's write transaction."""
+    conn.execute(
+        "INSERT INTO meta(key, value) VALUES (?, 1) ON CONFLICT(key) DO UPDATE SET value = value + 1",
+        (key,),
+    )
+    return read_version(conn, key)
+
+
+class LedgerCache:
+    """Compact transactions frame plus the ledger version it reflects.
+
+    The frame uses the layout of ``findash.compact`` (categoricals, int64
+    ids and minor-unit amounts, ``period``). Deltas are recorded in O(1)
+    and merged into the frame lazily, the next time ``transactions`` is
+    read, so a burst of writes costs one merge.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.version = None
+        self._frame = None
+        self._upserts = {}
+        self._deletes = set()
+        # Yeniden girilebilir: transactions, kilidi tutarken reload çağırır
+        self._lock = threading.RLock()
+
+    @metrics.instrumented()
+    def reload(self, save_snapshot: bool = None):
+        """Reads the whole ledger and its version from one consistent snapshot.
+
+        Rows come from the snapshot file when it is usable, so only those
+        written after it are read from SQLite. The file is rewritten when
+        that remainder reaches ``SNAPSHOT_MIN_ROWS``; ``save_snapshot=True``
+        always writes it, ``False`` never does.
+        """
+        saved = snapshot.read_snapshot(self.path)
+        with db.connection(self.path) as conn:
+            conn.execute("BEGIN")
+            try:
+                generation = snapshot.read_generation(conn)
+                loaded = snapshot.read_changes(conn, saved, generation)
+                if loaded is None:
+                    frame = read_compact(conn, TRANSACTIONS_SQL)
+                    loaded = frame, len(frame)
+            finally:
+                conn.commit()
+        frame, read_rows = loaded
+        if save_snapshot or (save_snapshot is None and read_rows >= snapshot.SNAPSHOT_MIN_ROWS):
+            if snapshot.write_snapshot(frame, generation, self.path):
+                # Dosyanın kapsadığı değişiklik kayıtları artık gerekmez
+                writer.write(snapshot.prune_changes, generation['seq'], path=self.path)
+        with self._lock:
+            self._frame = frame
+            self._upserts.clear()
+            self._deletes.clear()
+            self.version = generation['version']
+
+    def mark_stale(self, version: int):
+        """Moves to ``version`` and drops the frame; the next read reloads it."""
+        with self._lock:
+            self._frame = None
+            self._upserts.clear()
+            self._deletes.clear()
+            self.version = version
+
+    def apply(self, version: int, upserts=(), deletes=()):
+        """Applies the rows written by one ledger version; on drift marks the frame stale.
+
+        A gap means another writer got in between. The frame is then dropped
+        and reloaded by the next ``transactions`` read, never on the write path.
+        """
+        with self._lock:
+            if self.version is not None and version <= self.version:
+                # Daha yeni bir tam yükleme bu yazımı zaten içeriyor
+                return
+            if self._frame is not None and self.version is not None and version == self.version + 1:
+                for row in upserts:
+                    self._deletes.discard(row['id'])
+                    self._upserts[row['id']] = row
+                for tx_id in deletes:
+                    self._upserts.pop(tx_id, None)
+                    self._deletes.add(tx_id)
+                self.version = version
+                return
+        self.mark_stale(version)
+
+    @property
+    def transactions(self) -> pd.DataFrame:
+        # Yükleme, birleştirme ve dönüş tek kilit altında; arada mark_stale çerçeveyi None yapamaz
+        with self._lock:
+            if self._frame is None:
+                self.reload()
+            if self._upserts or self._deletes:
+                self._frame = self._merge_pending()
+            frame = self._frame
+        return frame
+
+    def _merge_pending(self) -> pd.DataFrame:
+        frame = self._frame
+        touched = self._deletes | set(self._upserts)
+        if touched:
+            frame = frame[~frame['id'].isin(touched)]
+        if self._upserts:
+            new_rows = compact_frame(pd.DataFrame(list(self._upserts.values())))
+            frame = concat_compact([new_rows, frame])
+            frame = frame.sort_values('date', ascending=False, kind='stable')
+        self._upserts.clear()
+        self._deletes.clear()
+        return frame.reset_index(drop=True)
+
+
+class LedgerStore:
+    """Ledger, account list and exchange rates cached once per process."""
+
+    def __init__(self, path: str = None, backend: str = None):
+        self.path = path
+        self.ledger = LedgerCache(path)
+        self.backend = make_backend(self, backend)
+        self.accounts = ()
+        self.accounts_version = None
+        self.rates_version = None
+        self._rates = None
+        self._rates_loaded = None
+        # (özet, sürümler) tek nesne; okuyucu ikisini farklı hesaplamalardan görmez
+        self._summary = None
+
+    @metrics.instrumented()
+    def sync(self):
+        """Reloads whichever cache is behind the version counters in ``meta``."""
+        with db.connection(self.path) as conn:
+            versions = read_versions(conn)
+        if versions.get(LEDGER_VERSION_KEY, 0) != self.ledger.version:
+            # Tam defter yalnızca okunduğunda yüklenir; özet ve sayfalar SQL'den gelir
+            self.ledger.mark_stale(versions.get(LEDGER_VERSION_KEY, 0))
+        if versions.get(ACCOUNTS_VERSION_KEY, 0) != self.accounts_version:
+            self.reload_accounts()
+        self.rates_version = versions.get(RATES_VERSION_KEY, 0)
+
+    def reload_accounts(self):
+        with db.connection(self.path) as conn:
+            conn.execute("BEGIN")
+            try:
+                version = read_version(conn, ACCOUNTS_VERSION_KEY)
+                rows = conn.execute("SELECT * FROM bank_accounts").fetchall()
+            finally:
+                conn.commit()
+        self.accounts = tuple(dict(r) for r in rows)
+        self.accounts_version = version
+
+    def rates(self) -> pd.DataFrame:
+        """Exchange-rate table, re-read only when the rates version moves."""
+        if self._rates is None or self._rates_loaded != self.rates_version:
+            with db.connection(self.path) as conn:
+                self._rates = load_rates(conn)
+            self._rates_loaded = self.rates_version
+        return self._rates
+
+    @metrics.instrumented()
+    def monthly_summary(self) -> pd.DataFrame:
+        """Monthly aggregates, re-read only when the ledger version moves.
+
+        ``total_base`` is ``total`` in the base currency, converted at each
+        month's first-day rate for the currency of the payment account.
+        """
+        return self.versioned_summary()[0]
+
+    def versioned_summary(self) -> tuple:
+        """``monthly_summary`` and the ``(ledger, accounts, rates)`` versions it was computed for.
+
+        Derived caches (the Dashboard figures) key on that tuple, not on the
+        store's current versions. If a ledger write lands during the read the
+        version is ``None`` and the result is not cached.
+        """
+        key = (self.ledger.version, self.accounts_version, self.rates_version)
+        cached = self._summary
+        if cached is not None and cached[1] == key:
+            return cached
+        with db.connection(self.path) as conn:
+            before = read_version(conn)
+        summary = self.backend.monthly_summary()
+        with db.connection(self.path) as conn:
+            after = read_version(conn)
+        summary['total_base'] = convert_by_account(summary, self.accounts, self.rates(), amount='total', date='month')
+        if before != after:
+            # Okuma sırasında bir yazım geldi; sonuç hangi sürüme ait olduğu belli olmadığından önbelleğe girmez
+            return summary, None
+        self._summary = (summary, (after,) + key[1:])
+        return self._summary
+
+    def top_expenses(self, month: str = None, limit: int = 5) -> pd.DataFrame:
+        return self.backend.top_expenses(month, limit)
+
+    def apply(self, version: int, upserts=(), deletes=()):
+        """Applies a transactions write and picks up the balance changes it made."""
+        self.ledger.apply(version, upserts=upserts, deletes=deletes)
+        self.sync()
@@ -0,0 +1,42 @@
+"""Small thread-safe LRU cache for values that are expensive to build."""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Keeps the ``maxsize`` most recently used values.
+
+    Keys must capture everything the value depends on (for figures: the
+    data versions, the selected period and the theme), so entries are never
+    invalidated explicitly; stale ones just fall off the end.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        # Kilidin dışında üretilir; aynı anahtarı iki oturum üretirse sonuncusu kalır
+        value = build()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
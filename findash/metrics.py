@@ -0,0 +1,160 @@
+"""Per-rerun performance counters: query count, rows fetched, wall time, peak memory.
+
+``start_run`` opens a collector for the current thread (one Streamlit
+rerun). Pooled connections count every statement and fetched row into it,
+and ``section`` / ``instrumented`` split the run into named, possibly
+nested parts. When no run is active all hooks return immediately. Peak
+memory comes from ``tracemalloc``, which is only started on request
+because it slows allocations down; it covers every thread of the process.
+"""
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger('findash.metrics')
+
+_current = contextvars.ContextVar('findash_metrics_run', default=None)
+_log_lock = threading.Lock()
+_log_paths = set()
+
+
+class RunMetrics:
+    """Counters of one rerun and of the sections entered during it."""
+
+    def __init__(self, label: str = '', trace_memory: bool = False):
+        self.label = label
+        self.queries = 0
+        self.rows = 0
+        self.sections = []
+        self.trace_memory = trace_memory
+        self.started_at = time.time()
+        self.finished = False
+        self.seconds = None
+        self.peak_kb = None
+        self._start = time.perf_counter()
+        self._stack = []
+        self._owns_tracing = False
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            tracemalloc.reset_peak()
+        self._memory_base = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+        self._peak_seen = 0
+
+    def _peak(self) -> int:
+        return max(self._peak_seen, tracemalloc.get_traced_memory()[1])
+
+    def finish(self) -> dict:
+        if not self.finished:
+            self.seconds = time.perf_counter() - self._start
+            if self.trace_memory:
+                self.peak_kb = round((self._peak() - self._memory_base) / 1024, 1)
+                if self._owns_tracing:
+                    tracemalloc.stop()
+            self.finished = True
+        return self.record()
+
+    def record(self) -> dict:
+        return {
+            'label': self.label,
+            'started_at': self.started_at,
+            'seconds': self.seconds,
+            'queries': self.queries,
+            'rows': self.rows,
+            'peak_kb': self.peak_kb,
+            'sections': list(self.sections),
+        }
+
+
+def start_run(label: str = '', trace_memory: bool = False) -> RunMetrics:
+    run = RunMetrics(label, trace_memory)
+    _current.set(run)
+    return run
+
+
+def stop_run():
+    """Detaches the current run from this thread; later hooks are no-ops."""
+    _current.set(None)
+
+
+def current_run():
+    return _current.get()
+
+
+def count_query(n: int = 1):
+    run = _current.get()
+    if run is not None:
+        run.queries += n
+
+
+def count_rows(n: int):
+    run = _current.get()
+    if run is not None:
+        run.rows += n
+
+
+@contextmanager
+def section(name: str):
+    """Records wall time, queries, rows and peak memory of the enclosed block."""
+    run = _current.get()
+    if run is None:
+        yield
+        return
+    entry = {'name': name, 'depth': len(run._stack)}
+    run.sections.append(entry)
+    queries, rows = run.queries, run.rows
+    if run.trace_memory:
+        # Dış bölümün tepe değeri, iç bölüm sıfırlamadan önce saklanır
+        run._peak_seen = run._peak()
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    run._stack.append(entry)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry['ms'] = round((time.perf_counter() - start) * 1000, 2)
+        entry['queries'] = run.queries - queries
+        entry['rows'] = run.rows - rows
+        if run.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            entry['peak_kb'] = round((peak - base) / 1024, 1)
+            run._peak_seen = max(run._peak_seen, peak)
+        run._stack.pop()
+
+
+def instrumented(name: str = None):
+    """Decorator form of ``section``; the name defaults to the function's qualified name."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with section(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def enable_log_file(path: str):
+    """Appends every logged run to ``path`` as one JSON object per line."""
+    with _log_lock:
+        if path in _log_paths:
+            return
+        handler = logging.FileHandler(path, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        _log_paths.add(path)
+
+
+def log_run(record: dict):
+    logger.info(json.dumps(record, ensure_ascii=False, default=str))
@@ -0,0 +1,77 @@
+"""Filtered, keyset-paginated reads of the transactions table and its yearly archives."""
+from typing import Any, Dict
+
+import pandas as pd
+
+from findash import archive, db, metrics
+from findash.search import fts_query
+
+TX_PAGE_SIZE = 50
+
+
+def transaction_filter_sql(t_type=None, min_date=None, max_date=None, category=None, search=None, schema: str = 'main'):
+    """Builds the WHERE clauses and parameters for the transaction list filters.
+
+    ``schema`` names the database holding the table, e.g. an attached archive.
+    """
+    clauses, params = [], []
+    if t_type:
+        clauses.append("type = ?")
+        params.append(t_type)
+    if min_date is not None:
+        clauses.append("date >= ?")
+        params.append(pd.to_datetime(min_date).isoformat())
+    if max_date is not None:
+        clauses.append("date < ?")
+        params.append((pd.to_datetime(max_date) + pd.Timedelta(days=1)).isoformat())
+    if category:
+        clauses.append("category = ?")
+        params.append(category)
+    match = fts_query(search) if search else None
+    if match:
+        clauses.append(f"rowid IN (SELECT rowid FROM {schema}.transactions_fts WHERE transactions_fts MATCH ?)")
+        params.append(match)
+    return clauses, params
+
+
+def _read_page(conn, schema: str, filters: Dict[str, Any], cursor, limit: int) -> pd.DataFrame:
+    clauses, params = transaction_filter_sql(**filters, schema=schema)
+    if cursor:
+        clauses.append("(date, id) < (?, ?)")
+        params += list(cursor)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return pd.read_sql_query(
+        f"SELECT * FROM {schema}.transactions {where} ORDER BY date DESC, id DESC LIMIT ?",
+        conn, params=params + [limit + 1]
+    )
+
+
+@metrics.instrumented()
+def load_transactions_page(filters: Dict[str, Any], cursor=None, limit: int = TX_PAGE_SIZE, path: str = None):
+    """Returns one page of filtered transactions (newest first) and the cursor of the next page.
+
+    Pages are keyset-paginated on ``(date, id)``, so every page is a single
+    indexed range scan no matter how large the ledger is. An archived year is
+    ATTACHed only when the page reaches it: the filtered date range and the
+    cursor include it, and the newer rows cannot fill the page.
+    """
+    filters = filters or {}
+    with db.connection(path) as conn:
+        df = _read_page(conn, 'main', filters, cursor, limit)
+        # Arşivler yeniden eskiye denenir; sayfayı daha yeni satırlarla dolduran sorgu eskilerini açmaz
+        for cold in archive.archives_between(conn, filters.get('min_date'), filters.get('max_date')):
+            if len(df) > limit and cold['max_date'] < df['date'].iloc[limit]:
+                break
+            if cursor is not None and cold['min_date'] > cursor[0]:
+                continue
+            with archive.attached(conn, [cold]) as (schema,):
+                older = _read_page(conn, schema, filters, cursor, limit)
+            if not older.empty:
+                merged = pd.concat([df, older], ignore_index=True) if not df.empty else older
+                df = merged.sort_values(['date', 'id'], ascending=False).head(limit + 1).reset_index(drop=True)
+    next_cursor = None
+    if len(df) > limit:
+        df = df.iloc[:limit]
+        next_cursor = (df['date'].iloc[-1], int(df['id'].iloc[-1]))
+    df['date'] = pd.to_datetime(df['date'])
+    return df, next_cursor
@@ -0,0 +1,86 @@
+"""Historical exchange rates and vectorized conversion to the base currency.
+
+``currency_rates`` holds one rate per currency and day, in ``BASE_CURRENCY``
+per unit. An amount converts at the latest rate on or before its date; the
+lookup is a single ``merge_asof`` over the whole column, so converting the
+accounts or the ledger is one pass regardless of the number of rows.
+Currencies without any stored rate fall back to ``DEFAULT_RATES``.
+"""
+import numpy as np
+import pandas as pd
+
+BASE_CURRENCY = 'TRY'
+DEFAULT_RATES = {'USD': 30.0, 'EUR': 33.0}
+
+RATES_DDL = """
+    CREATE TABLE IF NOT EXISTS currency_rates (
+        date TEXT NOT NULL,
+        currency TEXT NOT NULL,
+        rate REAL NOT NULL,
+        PRIMARY KEY (currency, date)
+    )
+"""
+
+UPSERT_RATE_SQL = """
+    INSERT INTO currency_rates(date, currency, rate) VALUES (?, ?, ?)
+    ON CONFLICT(currency, date) DO UPDATE SET rate = excluded.rate
+"""
+
+
+def write_rates(conn, frame: pd.DataFrame) -> int:
+    """Upserts ``date``/``currency``/``rate`` rows; returns the number written."""
+    frame = frame.dropna(subset=['date', 'currency', 'rate'])
+    dates = pd.to_datetime(frame['date']).dt.strftime('%Y-%m-%d')
+    conn.executemany(UPSERT_RATE_SQL, zip(
+        dates.tolist(), frame['currency'].str.strip().str.upper().tolist(), frame['rate'].astype(float).tolist(),
+    ))
+    return len(frame)
+
+
+def load_rates(conn) -> pd.DataFrame:
+    rates = pd.read_sql_query("SELECT date, currency, rate FROM currency_rates ORDER BY date", conn)
+    rates['date'] = pd.to_datetime(rates['date']).astype('datetime64[ns]')
+    rates['currency'] = rates['currency'].astype(str)
+    return rates
+
+
+def convert(frame: pd.DataFrame, rates: pd.DataFrame, amount: str = 'amount', currency: str = 'currency',
+            date: str = None) -> pd.Series:
+    """Returns ``frame[amount]`` in the base currency, aligned with ``frame``.
+
+    Rows are converted at the rate of their ``date`` column, or at the latest
+    known rate when ``date`` is None. Rows dated before a currency's first
+    rate use that first rate; unknown currencies count as the base currency.
+    """
+    if frame.empty:
+        return pd.Series(0.0, index=frame.index)
+    currencies = frame[currency].fillna(BASE_CURRENCY).astype(str).to_numpy()
+    if date is None:
+        when = np.full(len(frame), np.datetime64('now', 'ns'))
+    else:
+        when = pd.to_datetime(frame[date]).to_numpy('datetime64[ns]')
+
+    left = pd.DataFrame({'_pos': np.arange(len(frame)), 'date': when, 'currency': currencies})
+    left['currency'] = left['currency'].astype(str)
+    left = left.sort_values('date', kind='stable')
+    matched = pd.merge_asof(left, rates, on='date', by='currency', direction='backward')
+    rate = np.empty(len(frame))
+    rate[matched['_pos'].to_numpy()] = matched['rate'].to_numpy()
+
+    fallback = {**DEFAULT_RATES, **rates.groupby('currency')['rate'].first().to_dict(), BASE_CURRENCY: 1.0}
+    missing = np.isnan(rate)
+    if missing.any():
+        rate[missing] = pd.Series(currencies[missing]).map(fallback).fillna(1.0).to_numpy()
+    return pd.Series(frame[amount].to_numpy(dtype=float) * rate, index=frame.index)
+
+
+def convert_by_account(frame: pd.DataFrame, accounts, rates: pd.DataFrame, amount: str = 'amount',
+                       date: str = 'date') -> pd.Series:
+    """Converts ledger-shaped rows using the currency of their ``payment_method`` account."""
+    currency_of = {acc['name']: acc['currency'] for acc in accounts}
+    with_currency = pd.DataFrame({
+        'amount': frame[amount],
+        'date': frame[date],
+        'currency': frame['payment_method'].map(currency_of),
+    }, index=frame.index)
+    return convert(with_currency, rates, date='date')
@@ -0,0 +1,245 @@
+"""Database schema for the ledger, accounts and derived tables."""
+import threading
+
+from findash import db
+from findash.archive import ARCHIVES_DDL
+from findash.balances import CHECKPOINTS_DDL, backfill_opening_balances, rebuild_checkpoints
+from findash.ledger import ACCOUNTS_VERSION_KEY, bump_version
+from findash.rates import RATES_DDL
+from findash.search import create_search_index
+from findash.snapshot import create_change_log
+from findash.summary import SUMMARY_DDL, rebuild_summary
+
+TRANSACTIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT,
+        type TEXT,
+        category TEXT,
+        amount REAL,
+        description TEXT,
+        payment_method TEXT
+    )
+"""
+
+BANK_ACCOUNTS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        balance REAL,
+        currency TEXT,
+        account_type TEXT,
+        opening_balance REAL
+    )
+"""
+
+TRANSACTIONS_COLUMNS = ('date', 'type', 'category', 'amount', 'description', 'payment_method')
+BANK_ACCOUNTS_COLUMNS = ('name', 'balance', 'currency', 'account_type', 'opening_balance')
+
+
+SCHEMA_VERSION_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def _columns(conn, table: str) -> set:
+    return {col['name'] for col in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _add_column(conn, table: str, column: str, decl: str):
+    if column not in _columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _base_tables(conn):
+    conn.execute(TRANSACTIONS_DDL.format(table='transactions'))
+    conn.execute(BANK_ACCOUNTS_DDL.format(table='bank_accounts'))
+    # Eski veritabanlarında sonradan eklenen sütunlar
+    _add_column(conn, 'transactions', 'payment_method', 'TEXT')
+    _add_column(conn, 'bank_accounts', 'account_type', "TEXT DEFAULT 'Banka'")
+    # Açılış bakiyesi: mutabakatta defterden beklenen bakiyenin başlangıcı
+    _add_column(conn, 'bank_accounts', 'opening_balance', 'REAL')
+
+
+def _version_counters(conn):
+    # Her yazım ilgili sürüm sayacını artırır; paylaşılan önbellek sapmayı bununla anlar
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+    conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('ledger_version', 0), ('accounts_version', 0), ('rates_version', 0)")
+
+
+def _account_name_index(conn):
+    # Bakiye güncellemeleri hesabı isimle bulur; eski veride aynı isimli hesaplar varsa indeks benzersiz olamaz
+    duplicate = conn.execute("SELECT 1 FROM bank_accounts GROUP BY name HAVING COUNT(*) > 1 LIMIT 1").fetchone()
+    unique = '' if duplicate else 'UNIQUE '
+    conn.execute(f"CREATE {unique}INDEX IF NOT EXISTS idx_bank_accounts_name ON bank_accounts(name)")
+
+
+ACCOUNT_RENAMES_DDL = """
+    CREATE TABLE IF NOT EXISTS account_renames (
+        account_id INTEGER PRIMARY KEY,
+        old_name TEXT NOT NULL,
+        new_name TEXT NOT NULL,
+        renamed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def dedupe_account_names(conn):
+    """Renames all but the oldest account of each duplicated name, then makes names unique.
+
+    The ledger references accounts by name, so existing rows stay with the
+    oldest account; a renamed account keeps its balance as its opening
+    balance. Each rename is recorded in ``account_renames``.
+    """
+    conn.execute(ACCOUNT_RENAMES_DDL)
+    taken = {r[0] for r in conn.execute("SELECT name FROM bank_accounts")}
+    clashes = conn.execute(
+        "SELECT id, name FROM bank_accounts WHERE id NOT IN (SELECT MIN(id) FROM bank_accounts GROUP BY name) ORDER BY id"
+    ).fetchall()
+    for acc_id, name in clashes:
+        n = 2
+        while f"{name} ({n})" in taken:
+            n += 1
+        new_name = f"{name} ({n})"
+        taken.add(new_name)
+        conn.execute("UPDATE bank_accounts SET name = ?, opening_balance = balance WHERE id = ?", (new_name, acc_id))
+        conn.execute("INSERT INTO account_renames(account_id, old_name, new_name) VALUES (?, ?, ?)", (acc_id, name, new_name))
+    if clashes:
+        bump_version(conn, ACCOUNTS_VERSION_KEY)
+    # Yinelenen isimler varken 4. adım indeksi benzersiz olmadan oluşturmuş olabilir
+    conn.execute("DROP INDEX IF EXISTS idx_bank_accounts_name")
+    conn.execute("CREATE UNIQUE INDEX idx_bank_accounts_name ON bank_accounts(name)")
+
+
+def create_transaction_indexes(conn):
+    # Liste filtreleri ve (date, id) sıralı sayfalama için indeksler
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(type, date, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category, date, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_payment_method ON transactions(payment_method, date, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_type_amount ON transactions(type, amount)")
+
+
+def _monthly_summary(conn):
+    # Dashboard toplamları için aylık özet tablosu, mevcut veriden doldurulur
+    conn.execute(SUMMARY_DDL)
+    rebuild_summary(conn)
+
+
+def _currency_rates(conn):
+    # Günlük kurlar; kur kaydı olmayan para birimleri varsayılan kurla çevrilir
+    conn.execute(RATES_DDL)
+
+
+def _balance_checkpoints(conn):
+    # Aylık bakiye kontrol noktaları; tarihli bakiye sorguları tüm geçmişi taramaz
+    conn.execute(CHECKPOINTS_DDL)
+    rebuild_checkpoints(conn)
+    backfill_opening_balances(conn)
+
+
+def _archives(conn):
+    # Kapanmış yılların arşiv dosyaları; yalnızca tarih aralığı onlara uzanan sorgular bağlar
+    conn.execute(ARCHIVES_DDL)
+
+
+def _id_type(conn, table: str) -> str:
+    for col in conn.execute(f"PRAGMA table_info({table})"):
+        if col['name'] == 'id':
+            return col['type'].upper()
+    return ''
+
+
+def _rebuild_with_integer_ids(conn, table: str, ddl: str, columns, order_by: str):
+    cols = ', '.join(columns)
+    conn.execute(f"DROP TABLE IF EXISTS {table}_new")
+    conn.execute(ddl.format(table=f"{table}_new"))
+    conn.execute(f"INSERT INTO {table}_new({cols}) SELECT {cols} FROM {table} ORDER BY {order_by}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+
+def migrate_integer_ids(conn):
+    """Rewrites TEXT primary keys as AUTOINCREMENT integers, oldest row first.
+
+    Integer ids are assigned in ``(date, old id)`` order, so they sort like the
+    ledger, are never reused, and batched ``executemany`` inserts can leave
+    them to SQLite. Indexes, triggers and the FTS index of the old tables are
+    dropped with them and recreated by the later migrations.
+    """
+    if _id_type(conn, 'transactions') == 'TEXT':
+        conn.execute("DROP TABLE IF EXISTS transactions_fts")
+        _rebuild_with_integer_ids(conn, 'transactions', TRANSACTIONS_DDL, TRANSACTIONS_COLUMNS, "date, id")
+        bump_version(conn)
+    if _id_type(conn, 'bank_accounts') == 'TEXT':
+        _rebuild_with_integer_ids(conn, 'bank_accounts', BANK_ACCOUNTS_DDL, BANK_ACCOUNTS_COLUMNS, "CAST(id AS INTEGER), id")
+        bump_version(conn, ACCOUNTS_VERSION_KEY)
+
+
+# Sıra kalıcıdır: yeni adımlar yalnızca sona eklenir, uygulanmış bir adım değiştirilmez.
+# Adımlar, schema_version'dan önceki sürümlerin oluşturduğu tablolar üzerinde de güvenle çalışır.
+MIGRATIONS = (
+    (1, 'base_tables', _base_tables),
+    (2, 'version_counters', _version_counters),
+    (3, 'integer_ids', migrate_integer_ids),
+    (4, 'account_name_index', _account_name_index),
+    (5, 'transaction_indexes', create_transaction_indexes),
+    (6, 'monthly_summary', _monthly_summary),
+    (7, 'search_index', create_search_index),
+    (8, 'currency_rates', _currency_rates),
+    (9, 'balance_checkpoints', _balance_checkpoints),
+    (10, 'ledger_changes', create_change_log),
+    (11, 'archives', _archives),
+    (12, 'account_name_unique', dedupe_account_names),
+)
+
+
+def schema_version(conn) -> int:
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'").fetchone():
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(conn) -> list:
+    """Applies the pending migrations inside the caller's write transaction; returns their names."""
+    conn.execute(SCHEMA_VERSION_DDL)
+    current = schema_version(conn)
+    applied = []
+    for version, name, step in MIGRATIONS:
+        if version <= current:
+            continue
+        step(conn)
+        conn.execute("INSERT INTO schema_version(version, name) VALUES (?, ?)", (version, name))
+        applied.append(name)
+    return applied
+
+
+def init_db(path: str = None) -> list:
+    """Brings the database file up to the latest schema version, once per process.
+
+    A current file costs one read. Otherwise the lock keeps sessions of this
+    process from migrating concurrently, and ``BEGIN IMMEDIATE`` does the
+    same across processes; whoever comes second finds ``schema_version``
+    current and applies nothing.
+    """
+    path = path or db.DB_PATH
+    if path in _migrated:
+        return []
+    with _migrate_lock:
+        if path in _migrated:
+            return []
+        with db.connection(path) as conn:
+            current = schema_version(conn)
+        applied = []
+        if current < MIGRATIONS[-1][0]:
+            with db.transaction(path) as conn:
+                applied = migrate(conn)
+        _migrated.add(path)
+    return applied
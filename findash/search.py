@@ -0,0 +1,94 @@
+"""FTS5 full-text index over transaction descriptions, categories and payment methods.
+
+``transactions_fts`` is an external-content FTS5 table keyed by the
+``transactions`` rowid and kept in sync by triggers. Text is indexed with
+the ``unicode61`` tokenizer with diacritics removed, after folding the
+Turkish dotless ``ı`` to ``i`` (``İ``/``I`` already fold to ``i`` in the
+tokenizer), so "istanbul", "İSTANBUL" and "ıstanbul" match each other and
+"maas" matches "Maaş". Queries match token prefixes.
+"""
+import re
+from contextlib import contextmanager
+
+FTS_COLUMNS = ('description', 'category', 'payment_method')
+
+
+def _fold_sql(expr: str) -> str:
+    return f"replace(coalesce({expr}, ''), 'ı', 'i')"
+
+
+def _values(prefix: str) -> str:
+    return ', '.join(_fold_sql(f"{prefix}.{col}") for col in FTS_COLUMNS)
+
+
+FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    + ', '.join(FTS_COLUMNS)
+    + ", content='transactions', tokenize='unicode61 remove_diacritics 2')"
+)
+
+FTS_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, {', '.join(FTS_COLUMNS)}) VALUES (new.rowid, {_values('new')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, {', '.join(FTS_COLUMNS)})
+        VALUES ('delete', old.rowid, {_values('old')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF {', '.join(FTS_COLUMNS)} ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, {', '.join(FTS_COLUMNS)})
+        VALUES ('delete', old.rowid, {_values('old')});
+        INSERT INTO transactions_fts(rowid, {', '.join(FTS_COLUMNS)}) VALUES (new.rowid, {_values('new')});
+    END
+    """,
+)
+
+
+def create_search_index(conn):
+    """Creates the FTS table and triggers, indexing existing rows the first time."""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions_fts'").fetchone()
+    conn.execute(FTS_DDL)
+    for trigger in FTS_TRIGGERS:
+        conn.execute(trigger)
+    if not exists:
+        rebuild_search_index(conn)
+
+
+def rebuild_search_index(conn):
+    # 'rebuild' komutu ham içeriği okur; katlanmış metin için elle doldurulur
+    conn.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('delete-all')")
+    conn.execute(
+        f"INSERT INTO transactions_fts(rowid, {', '.join(FTS_COLUMNS)}) SELECT rowid, {_values('transactions')} FROM transactions"
+    )
+
+
+@contextmanager
+def deferred_indexing(conn):
+    """Indexes rows inserted inside the block in one statement instead of one trigger call each.
+
+    Must run inside a write transaction: if the block fails, the rollback
+    also restores the insert trigger. AUTOINCREMENT ids never go back, so
+    every new row has a rowid above the current maximum.
+    """
+    start = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM transactions").fetchone()[0]
+    conn.execute("DROP TRIGGER IF EXISTS transactions_fts_ai")
+    yield
+    conn.execute(FTS_TRIGGERS[0])
+    conn.execute(
+        f"INSERT INTO transactions_fts(rowid, {', '.join(FTS_COLUMNS)}) SELECT rowid, {_values('transactions')}"
+        " FROM transactions WHERE rowid > ?",
+        (start,),
+    )
+
+
+def fts_query(text: str):
+    """Turns free text into an FTS5 query: every word must match as a prefix."""
+    words = re.findall(r'\w+', (text or '').replace('ı', 'i'))
+    if not words:
+        return None
+    return ' '.join('"' + w.replace('"', '""') + '"*' for w in words)
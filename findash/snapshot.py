@@ -0,0 +1,186 @@
+"""Columnar snapshot of the ledger stored next to the database file.
+
+``read_sql_query`` creates Python objects for every row and parses every
+date on each cold start. The snapshot stores the compact frame
+(``findash.compact``) as an uncompressed Arrow IPC file, ``<db>.ledger.arrow``.
+On load the file is memory-mapped, so the id, amount and date columns are
+neither parsed nor copied.
+
+The file is tagged with the write generation it reflects: the ledger
+version, the last transaction id handed out, and the last sequence number
+of ``ledger_changes``. Only the rows that changed after that generation are
+read from SQLite. Ids above the largest id are new rows, because
+AUTOINCREMENT ids never go back. Triggers log updates and deletes of older
+rows in ``ledger_changes``. ``meta.ledger_epoch`` is redrawn when the whole
+ledger is replaced, which invalidates every snapshot.
+
+Snapshots need the optional ``pyarrow`` package. Without it the ledger is
+read from SQLite as before.
+"""
+import json
+import os
+import threading
+
+import pandas as pd
+
+from findash import db
+from findash.compact import concat_compact, read_compact
+
+FORMAT = 1
+# Bu kadar satır SQLite'tan okunduysa anlık görüntü (yeniden) yazılır
+SNAPSHOT_MIN_ROWS = 50_000
+EPOCH_KEY = 'ledger_epoch'
+PRUNED_KEY = 'ledger_changes_pruned'
+
+CHANGES_DDL = """
+    CREATE TABLE IF NOT EXISTS ledger_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        tx_id INTEGER NOT NULL
+    )
+"""
+
+CHANGES_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_changes_au AFTER UPDATE ON transactions BEGIN
+        INSERT INTO ledger_changes(tx_id) VALUES (old.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_changes_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO ledger_changes(tx_id) VALUES (old.id);
+    END
+    """,
+)
+
+GENERATION_SQL = f"""
+    SELECT (SELECT value FROM meta WHERE key = 'ledger_version'),
+           (SELECT value FROM meta WHERE key = '{EPOCH_KEY}'),
+           (SELECT value FROM meta WHERE key = '{PRUNED_KEY}'),
+           (SELECT seq FROM sqlite_sequence WHERE name = 'ledger_changes'),
+           (SELECT seq FROM sqlite_sequence WHERE name = 'transactions')
+"""
+
+CHANGED_ROWS_SQL = """
+    SELECT * FROM transactions
+    WHERE id > ? OR id IN (SELECT tx_id FROM ledger_changes WHERE seq > ?)
+    ORDER BY date DESC
+"""
+
+
+def create_change_log(conn):
+    """Creates the change log, its triggers and the ledger epoch."""
+    conn.execute(CHANGES_DDL)
+    for trigger in CHANGES_TRIGGERS:
+        conn.execute(trigger)
+    conn.execute(f"INSERT OR IGNORE INTO meta(key, value) VALUES ('{EPOCH_KEY}', abs(random())), ('{PRUNED_KEY}', 0)")
+
+
+def reset_change_log(conn):
+    """Starts a new epoch after the whole ledger was replaced; older snapshots become unusable."""
+    conn.execute("DELETE FROM ledger_changes")
+    conn.execute(f"UPDATE meta SET value = abs(random()) WHERE key = '{EPOCH_KEY}'")
+
+
+def prune_changes(conn, seq: int):
+    """Drops the log entries a snapshot up to ``seq`` already reflects."""
+    conn.execute("DELETE FROM ledger_changes WHERE seq <= ?", (seq,))
+    conn.execute(f"UPDATE meta SET value = MAX(value, ?) WHERE key = '{PRUNED_KEY}'", (seq,))
+
+
+def read_generation(conn) -> dict:
+    """Write generation of the ledger, read inside the caller's transaction."""
+    version, epoch, pruned, seq, max_id = conn.execute(GENERATION_SQL).fetchone()
+    return {'format': FORMAT, 'version': version or 0, 'epoch': epoch, 'pruned': pruned or 0,
+            'seq': seq or 0, 'max_id': max_id or 0}
+
+
+def snapshot_path(path: str = None) -> str:
+    return f"{path or db.DB_PATH}.ledger.arrow"
+
+
+def _arrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        return None
+    return pa
+
+
+def write_snapshot(frame: pd.DataFrame, generation: dict, path: str = None) -> int:
+    """Writes ``frame`` tagged with ``generation``; returns the file size, 0 if skipped.
+
+    The file is written under a temporary name and renamed, so readers see
+    either the old snapshot or the new one.
+    """
+    pa = _arrow()
+    if pa is None:
+        return 0
+    target = snapshot_path(path)
+    # Dönem sütunu Arrow'da karşılığı olmadığından ay sırası (ordinal) olarak saklanır
+    columns = frame.assign(period=frame['period'].array.asi8)
+    table = pa.Table.from_pandas(columns, preserve_index=False)
+    table = table.replace_schema_metadata({b'findash': json.dumps(generation).encode()})
+    # Oturumlar aynı sürecin iş parçacıklarıdır; geçici ad iş parçacığına da özgü olmalı
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, target)
+    except OSError:
+        # Anlık görüntü yalnızca hızlandırma; yazılamazsa defter SQLite'tan okunmaya devam eder
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return 0
+    return os.path.getsize(target)
+
+
+def read_snapshot(path: str = None):
+    """Memory-maps the snapshot; returns ``(frame, generation)`` or ``None``."""
+    target = snapshot_path(path)
+    if not os.path.exists(target):
+        return None
+    pa = _arrow()
+    if pa is None:
+        return None
+    try:
+        table = pa.ipc.open_file(pa.memory_map(target)).read_all()
+        generation = json.loads(table.schema.metadata[b'findash'])
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
+    if generation.get('format') != FORMAT:
+        return None
+    # split_blocks: boş değer içermeyen sayısal sütunlar eşlenmiş bellekten kopyalanmadan kullanılır
+    frame = table.to_pandas(split_blocks=True)
+    frame['period'] = pd.arrays.PeriodArray(frame['period'].to_numpy(), dtype=pd.PeriodDtype('M'))
+    return frame, generation
+
+
+def usable(snapshot_generation: dict, generation: dict) -> bool:
+    """Whether the log still covers every change since the snapshot was written."""
+    return (snapshot_generation['epoch'] == generation['epoch']
+            and generation['pruned'] <= snapshot_generation['seq'] <= generation['seq']
+            and snapshot_generation['max_id'] <= generation['max_id']
+            and snapshot_generation['version'] <= generation['version'])
+
+
+def read_changes(conn, snapshot, generation: dict):
+    """Brings a snapshot up to ``generation`` with the rows written after it.
+
+    Returns ``(frame, rows read from SQLite)``, or ``None`` when the snapshot
+    is unusable and the whole table must be read.
+    """
+    if snapshot is None:
+        return None
+    frame, tagged = snapshot
+    if not usable(tagged, generation):
+        return None
+    if (tagged['seq'], tagged['max_id']) == (generation['seq'], generation['max_id']):
+        return frame, 0
+    changed = [r[0] for r in conn.execute("SELECT DISTINCT tx_id FROM ledger_changes WHERE seq > ?", (tagged['seq'],))]
+    rows = read_compact(conn, CHANGED_ROWS_SQL, params=(tagged['max_id'], tagged['seq']))
+    if changed:
+        frame = frame[~frame['id'].isin(changed)]
+    if not rows.empty:
+        frame = concat_compact([rows, frame]).sort_values('date', ascending=False, kind='stable')
+    return frame.reset_index(drop=True), len(rows)
@@ -0,0 +1,93 @@
+"""Monthly aggregates of the ledger, maintained by the write paths.
+
+``monthly_summary`` holds one row per month x type x category x payment
+method with the summed amount and row count. Writers adjust it inside the
+same SQL transaction as the ledger row, so dashboard queries read a table
+whose size depends on the number of months, not on the number of rows.
+Months of archived years (``findash.archive``) stay in the table; their
+rows are no longer in ``transactions``.
+"""
+import pandas as pd
+
+from findash import archive, metrics
+
+SUMMARY_DDL = """
+    CREATE TABLE IF NOT EXISTS monthly_summary (
+        month TEXT NOT NULL,
+        type TEXT NOT NULL,
+        category TEXT NOT NULL,
+        payment_method TEXT NOT NULL,
+        total REAL NOT NULL DEFAULT 0,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (month, type, category, payment_method)
+    )
+"""
+
+
+def _key(date_iso, t_type, category, payment_method):
+    return (str(date_iso)[:7], t_type or '', category or '', payment_method or '')
+
+
+UPSERT_SQL = """
+    INSERT INTO monthly_summary(month, type, category, payment_method, total, count)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(month, type, category, payment_method)
+    DO UPDATE SET total = total + excluded.total, count = count + excluded.count
+"""
+
+
+def apply_summary_delta(conn, date_iso, t_type, category, payment_method, amount, sign: int = 1):
+    """Adds (``sign=1``) or removes (``sign=-1``) one ledger row from the aggregates."""
+    key = _key(date_iso, t_type, category, payment_method)
+    conn.execute(UPSERT_SQL, key + (sign * float(amount), sign))
+    if sign < 0:
+        conn.execute(
+            "DELETE FROM monthly_summary WHERE month = ? AND type = ? AND category = ? AND payment_method = ? AND count <= 0",
+            key,
+        )
+
+
+def add_summary_rows(conn, rows):
+    """Merges pre-aggregated ``(month, type, category, payment_method, total, count)`` rows."""
+    conn.executemany(UPSERT_SQL, rows)
+
+
+def rebuild_summary(conn):
+    """Recomputes the aggregates of ``transactions`` in one grouped scan; archived months are kept."""
+    conn.execute(f"DELETE FROM monthly_summary WHERE NOT {archive.archived_month_sql(conn)}")
+    conn.execute(
+        """
+        INSERT INTO monthly_summary(month, type, category, payment_method, total, count)
+        SELECT substr(date, 1, 7), COALESCE(type, ''), COALESCE(category, ''), COALESCE(payment_method, ''),
+               SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def load_summary(conn) -> pd.DataFrame:
+    return pd.read_sql_query(
+        "SELECT month, type, category, payment_method, total, count FROM monthly_summary", conn
+    )
+
+
+@metrics.instrumented()
+def load_top_expenses(conn, month: str = None, limit: int = 5) -> pd.DataFrame:
+    """Largest single expenses, optionally within one ``YYYY-MM`` month.
+
+    Individual rows cannot come from the aggregates; this is a LIMIT query
+    over the (type, amount) / (type, date) indexes instead of a full scan,
+    repeated on the archives the month reaches (all of them without one).
+    """
+    clauses, params, start = ["type = 'Expense'"], [], None
+    if month:
+        start = pd.Timestamp(f"{month}-01")
+        clauses.append("date >= ? AND date < ?")
+        params = [start.isoformat(), (start + pd.offsets.MonthBegin(1)).isoformat()]
+    select = f"SELECT category, amount FROM {{transactions}} WHERE {' AND '.join(clauses)} ORDER BY amount DESC LIMIT ?"
+    with archive.ledger_sources(conn, start, start) as schemas:
+        return pd.read_sql_query(
+            f"SELECT category, amount FROM ({archive.union_all(select, schemas)}) ORDER BY amount DESC LIMIT ?",
+            conn, params=(params + [limit]) * len(schemas) + [limit],
+        )
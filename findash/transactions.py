@@ -0,0 +1,119 @@
+"""Single-row ledger writes with their balance and aggregate bookkeeping.
+
+``insert_row`` / ``update_row`` / ``delete_row`` run on the writer's
+connection (see ``findash.writer``) and, in the same SQL transaction, adjust
+the account balance, ``monthly_summary`` and ``balance_checkpoints`` and bump
+the ledger version. They return that version so callers can apply the row
+to an in-memory ``LedgerCache``. ``insert_transaction`` and friends queue the
+operation and wait for its commit.
+"""
+import pandas as pd
+
+from findash import archive, metrics, writer
+from findash.balances import apply_checkpoint_delta
+from findash.ledger import ACCOUNTS_VERSION_KEY, bump_version
+from findash.summary import apply_summary_delta
+
+_SELECT_OLD = "SELECT date, type, category, amount, payment_method FROM transactions WHERE id = ?"
+
+
+def adjust_account_balance(payment_method_name, amount, transaction_type, conn=None, path: str = None):
+    """Adjusts account balance based on transaction type.
+
+    A single indexed ``UPDATE`` applies the delta, so it runs in O(1) and
+    commits together with the caller's transaction when ``conn`` is given;
+    otherwise it is queued on the writer.
+    """
+    if conn is None:
+        return writer.write(lambda conn: adjust_account_balance(payment_method_name, amount, transaction_type, conn),
+                            path=path)
+    delta = float(amount) if transaction_type == 'Income' else -float(amount)
+    cur = conn.execute("UPDATE bank_accounts SET balance = balance + ? WHERE name = ?", (delta, payment_method_name))
+    if cur.rowcount > 0:
+        bump_version(conn, ACCOUNTS_VERSION_KEY)
+        return True
+    return False
+
+
+def _row(tx_id, date_iso, t_type, category, amount, desc, payment_method) -> dict:
+    return {'id': tx_id, 'date': date_iso, 'type': t_type, 'category': category,
+            'amount': float(amount), 'description': desc, 'payment_method': payment_method}
+
+
+def _reverse(conn, old):
+    reverse_type = 'Expense' if old['type'] == 'Income' else 'Income'
+    adjust_account_balance(old['payment_method'], old['amount'], reverse_type, conn)
+    apply_summary_delta(conn, old['date'], old['type'], old['category'], old['payment_method'], old['amount'], sign=-1)
+    apply_checkpoint_delta(conn, old['date'], old['type'], old['payment_method'], old['amount'], sign=-1)
+
+
+def insert_row(conn, t_type, amount, category, date, desc, payment_method):
+    """Inserts a transaction; returns the new ledger version and the written row."""
+    date_iso = pd.to_datetime(date).isoformat()
+    archive.ensure_open(conn, [date_iso[:4]])
+    cur = conn.execute(
+        "INSERT INTO transactions(date, type, category, amount, description, payment_method) VALUES (?, ?, ?, ?, ?, ?)",
+        (date_iso, t_type, category, float(amount), desc, payment_method)
+    )
+    new_id = cur.lastrowid
+    adjust_account_balance(payment_method, amount, t_type, conn)
+    apply_summary_delta(conn, date_iso, t_type, category, payment_method, amount)
+    apply_checkpoint_delta(conn, date_iso, t_type, payment_method, amount)
+    version = bump_version(conn)
+    return version, _row(new_id, date_iso, t_type, category, amount, desc, payment_method)
+
+
+def update_row(conn, tx_id: int, t_type: str, amount: float, category: str, date_val, desc: str, payment_method: str):
+    """Updates a transaction and its balances; returns the new ledger version and row.
+
+    Raises ``LookupError`` when the row is not in the open ledger (deleted or
+    archived).
+    """
+    date_iso = pd.to_datetime(date_val).isoformat()
+    archive.ensure_open(conn, [date_iso[:4]])
+    old_tx = conn.execute(_SELECT_OLD, (tx_id,)).fetchone()
+    if not old_tx:
+        # Satır başka bir oturumda silinmiş olabilir; bakiye satırsız değişmemeli
+        raise LookupError(f"{tx_id} numaralı işlem açık defterde bulunamadı (silinmiş ya da arşivlenmiş olabilir).")
+    _reverse(conn, old_tx)
+    adjust_account_balance(payment_method, float(amount), t_type, conn)
+    apply_summary_delta(conn, date_iso, t_type, category, payment_method, amount)
+    apply_checkpoint_delta(conn, date_iso, t_type, payment_method, amount)
+
+    conn.execute(
+        "UPDATE transactions SET date = ?, type = ?, category = ?, amount = ?, description = ?, payment_method = ? WHERE id = ?",
+        (date_iso, t_type, category, float(amount), desc, payment_method, tx_id)
+    )
+    version = bump_version(conn)
+    row = _row(tx_id, date_iso, t_type, category, amount, desc, payment_method)
+    return version, row
+
+
+def delete_row(conn, tx_id: int) -> int:
+    """Deletes a transaction and reverses its balance; returns the new ledger version.
+
+    Raises ``LookupError`` when the row is not in the open ledger, e.g. it was
+    already deleted or its year was archived (archives are read-only).
+    """
+    tx = conn.execute(_SELECT_OLD, (tx_id,)).fetchone()
+    if not tx:
+        raise LookupError(f"{tx_id} numaralı işlem açık defterde bulunamadı (silinmiş ya da arşivlenmiş olabilir).")
+    _reverse(conn, tx)
+    conn.execute("DELETE FROM transactions WHERE id = ?", (tx_id,))
+    return bump_version(conn)
+
+
+@metrics.instrumented()
+def insert_transaction(t_type, amount, category, date, desc, payment_method, path: str = None):
+    return writer.write(insert_row, t_type, amount, category, date, desc, payment_method, path=path)
+
+
+@metrics.instrumented()
+def update_transaction(tx_id: int, t_type: str, amount: float, category: str, date_val, desc: str,
+                       payment_method: str, path: str = None):
+    return writer.write(update_row, tx_id, t_type, amount, category, date_val, desc, payment_method, path=path)
+
+
+@metrics.instrumented()
+def delete_transaction(tx_id: int, path: str = None) -> int:
+    return writer.write(delete_row, tx_id, path=path)
@@ -0,0 +1,171 @@
+"""Single writer thread that serializes and batches every database mutation.
+
+Writes are submitted as callables taking a connection as their first
+argument and return a ``concurrent.futures.Future``. One thread per database
+file drains the queue: under concurrent load, operations arriving within
+``WRITE_WINDOW`` of each other run in a single ``BEGIN IMMEDIATE``
+transaction, each inside its own savepoint so a failing operation is rolled
+back alone, and the futures are resolved only after the commit. Sessions therefore never compete for the
+SQLite write lock, and a resolved future means the write is durable.
+"""
+import atexit
+import contextvars
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from findash import db
+
+WRITE_WINDOW = 0.001
+MAX_BATCH = 256
+
+_STOP = object()
+
+
+class WriteQueue:
+    """Queue of pending writes to one database file and the thread that commits them."""
+
+    def __init__(self, path: str = None, window: float = WRITE_WINDOW, max_batch: int = MAX_BATCH):
+        self.path = path or db.DB_PATH
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.writes = 0
+        self._last_batch = 0
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='findash-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Queues ``fn(conn, *args, **kwargs)``; the future holds its return value."""
+        if threading.current_thread() is self._thread:
+            # Yazıcı iş parçacığı kendi kuyruğunu bekleyemez; işlem zaten bir bağlantı alır
+            raise RuntimeError("write operations must use the connection they are given")
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("write queue is closed")
+            # Ölçüm (findash.metrics) gibi bağlam değişkenleri yazıcı iş parçacığına taşınır
+            self._queue.put((future, contextvars.copy_context(), fn, args, kwargs))
+        return future
+
+    def close(self):
+        """Commits what is already queued, then stops the thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self):
+        item = self._queue.get()
+        if item is _STOP:
+            return None
+        batch = [item]
+        # Pencere, iki yazım arasındaki en uzun bekleme. Önceki grup tek yazımsa
+        # eşzamanlı yazan yoktur; beklemeden yalnızca kuyruktakiler alınır.
+        window = self.window if self._last_batch > 1 else 0
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=window) if window else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        conn = db.open_connection(self.path)
+        try:
+            while True:
+                batch = self._collect()
+                if batch is None:
+                    break
+                self._last_batch = len(batch)
+                self._commit(conn, [item for item in batch if item[0].set_running_or_notify_cancel()])
+        finally:
+            conn.close()
+
+    def _commit(self, conn, batch):
+        if not batch:
+            return
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for future, context, fn, args, kwargs in batch:
+                conn.execute("SAVEPOINT write_op")
+                try:
+                    result = context.run(fn, conn, *args, **kwargs)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_op")
+                    outcomes.append((future, None, e))
+                else:
+                    outcomes.append((future, result, None))
+                conn.execute("RELEASE write_op")
+            conn.commit()
+        except BaseException as e:
+            if conn.in_transaction:
+                conn.rollback()
+            for future, *_ in batch:
+                future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        self.batches += 1
+        self.writes += len(batch)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path: str = None) -> WriteQueue:
+    path = path or db.DB_PATH
+    writer = _writers.get(path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(path)
+            if writer is None:
+                writer = _writers[path] = WriteQueue(path)
+    return writer
+
+
+def submit(fn, *args, path: str = None, **kwargs) -> Future:
+    """Queues ``fn(conn, *args, **kwargs)`` on the writer of ``path``."""
+    return get_writer(path).submit(fn, *args, **kwargs)
+
+
+def write(fn, *args, path: str = None, **kwargs):
+    """Like ``submit``, but waits for the commit and returns the result."""
+    return get_writer(path).submit(fn, *args, **kwargs).result()
+
+
+def close_writers():
+    """Drains and stops every writer thread (used by benchmarks and at exit)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def _reset_after_fork():
+    # Yazıcı iş parçacıkları çocuk sürece kopyalanmaz; ilk yazımda yenisi açılır
+    global _writers, _writers_lock
+    _writers = {}
+    _writers_lock = threading.Lock()
+
+
+atexit.register(close_writers)
+os.register_at_fork(after_in_child=_reset_after_fork)
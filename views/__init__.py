@@ -0,0 +1 @@
+"""Streamlit page modules; ``app.py`` imports only the selected one."""
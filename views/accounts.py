@@ -0,0 +1,152 @@
+"""Account pages (Banka, Kredi Kartı, Nakit, Yemek Kartı), one view per account type."""
+import datetime
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+
+from findash import db, metrics, writer
+from findash.accounts import delete_account, insert_account
+from findash.balances import ACCOUNT_PAGE_SIZE, account_monthly_totals, balance_as_of, load_account_page
+from views.common import get_store
+
+ACCOUNT_CSS = """
+<style>
+    .bank-card {
+        background-color: #e6f3ff;
+        border: 1px solid #c7e6ff;
+        padding: 12px;
+        border-radius: 10px;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.05);
+        color: #0f172a;
+    }
+    [data-theme="dark"] .bank-card {
+        background-color: #072033;
+        border: 1px solid #12394a;
+        color: #e6eef8;
+    }
+</style>
+"""
+
+@metrics.instrumented()
+def insert_account_db(acc: dict):
+    writer.write(insert_account, acc)
+
+@metrics.instrumented()
+def delete_account_db(acc_id: int):
+    writer.write(delete_account, acc_id)
+
+@metrics.instrumented('account_manager')
+def render(page_title, account_type):
+    st.markdown(ACCOUNT_CSS, unsafe_allow_html=True)
+    st.subheader(page_title)
+    
+    with st.expander(f"Yeni {page_title} Ekle", expanded=True):
+        with st.form(f"add_{account_type.replace(' ', '_')}_form"):
+            c1, c2, c3 = st.columns(3)
+            with c1: b_name = st.text_input("Hesap Adı")
+            with c2: b_bal = st.number_input("Bakiye", min_value=0.0, value=0.0)
+            with c3: b_curr = st.selectbox("Para Birimi", ["TRY", "USD", "EUR"])
+            
+            if st.form_submit_button("Hesap Ekle"):
+                new_acc = {
+                    'name': b_name, 
+                    'balance': b_bal, 
+                    'currency': b_curr,
+                    'account_type': account_type
+                }
+                try:
+                    insert_account_db(new_acc)
+                except sqlite3.IntegrityError:
+                    st.error("Bu isimde bir hesap zaten var.")
+                else:
+                    get_store().sync()
+                    st.success("Hesap eklendi!")
+                    st.rerun()
+
+    st.markdown(f"### {page_title} Listesi")
+    
+    # Filtrele: Sadece bu sayfanın tipine uygun hesapları göster
+    filtered_accounts = [acc for acc in get_store().accounts if acc['account_type'] == account_type]
+    
+    if not filtered_accounts:
+        st.info(f"Kayıtlı {page_title} bulunamadı.")
+    else:
+        # Aynı isimli eski hesaplar 12. şema adımında yeniden adlandırıldı; kullanıcı nedenini görsün
+        with db.connection() as conn:
+            renames = conn.execute(
+                f"SELECT old_name, new_name FROM account_renames WHERE account_id IN ({', '.join('?' * len(filtered_accounts))})",
+                [acc['id'] for acc in filtered_accounts],
+            ).fetchall()
+        for old_name, new_name in renames:
+            st.info(f"Aynı isimli hesaplar ayrıldı: '{old_name}' adlı ikinci hesap '{new_name}' olarak yeniden adlandırıldı. "
+                    f"Eski işlemler '{old_name}' hesabında kaldı.")
+        for acc in filtered_accounts:
+            col_info, col_del = st.columns([4, 1])
+            with col_info:
+                st.markdown(f"<div class='bank-card'>💳 <strong>{acc['name']}</strong> - {acc['balance']:,.2f} {acc['currency']}</div>", unsafe_allow_html=True)
+            with col_del:
+                if st.button("Sil", key=f"del_{acc['id']}"):
+                    delete_account_db(acc['id'])
+                    get_store().sync()
+                    st.success("Hesap silindi!")
+                    st.rerun()
+
+        with st.expander("Tarihli Bakiye", expanded=False):
+            as_of = st.date_input("Tarih", value=datetime.date.today(), key=f"as_of_{account_type}")
+            # Her hesap için bir kontrol noktası okuması ve tek aylık fark toplamı
+            with db.connection() as conn:
+                as_of_rows = [{'Hesap': acc['name'], 'Tarihteki Bakiye': balance_as_of(conn, acc['name'], as_of),
+                               'Güncel Bakiye': acc['balance'], 'Para Birimi': acc['currency']}
+                              for acc in filtered_accounts]
+            st.dataframe(pd.DataFrame(as_of_rows), hide_index=True, width='stretch',
+                         column_config={'Tarihteki Bakiye': st.column_config.NumberColumn(format="%.2f"),
+                                        'Güncel Bakiye': st.column_config.NumberColumn(format="%.2f")})
+
+        render_account_ledger(account_type, filtered_accounts)
+
+@metrics.instrumented('account_ledger')
+def render_account_ledger(account_type, accounts):
+    """Drill-down ledger of one account: monthly totals and keyset-paged rows with running balances."""
+    with st.expander("Hesap Defteri", expanded=False):
+        names = [acc['name'] for acc in accounts]
+        selected = st.selectbox("Hesap", names, key=f"ledger_account_{account_type}")
+        currency = next(acc['currency'] for acc in accounts if acc['name'] == selected)
+        # Hesap değişince sayfalama baştan başlar; imleçler (tarih, id, önceki bakiye) taşır
+        cursors_key = f"ledger_cursors_{account_type}"
+        if st.session_state.get(f"ledger_cursors_for_{account_type}") != selected:
+            st.session_state[f"ledger_cursors_for_{account_type}"] = selected
+            st.session_state[cursors_key] = [None]
+        page_cursors = st.session_state[cursors_key]
+
+        with db.connection() as conn:
+            months = account_monthly_totals(conn, selected)
+            rows, next_cursor = load_account_page(conn, selected, cursor=page_cursors[-1], limit=ACCOUNT_PAGE_SIZE)
+
+        money = st.column_config.NumberColumn(format="%.2f")
+        st.markdown(f"**Aylık Giriş / Çıkış ({currency})**")
+        st.dataframe(months.rename(columns={'month': 'Ay', 'income': 'Giriş', 'expense': 'Çıkış',
+                                            'net': 'Net', 'closing_balance': 'Ay Sonu Bakiye'}),
+                     hide_index=True, width='stretch', height=240,
+                     column_config={c: money for c in ('Giriş', 'Çıkış', 'Net', 'Ay Sonu Bakiye')})
+
+        st.markdown(f"**İşlemler** (Sayfa {len(page_cursors)})")
+        col_prev, col_next = st.columns(2)
+        if col_prev.button("◀ Önceki", key=f"ledger_prev_{account_type}", disabled=len(page_cursors) == 1):
+            page_cursors.pop()
+            st.rerun()
+        if col_next.button("Sonraki ▶", key=f"ledger_next_{account_type}", disabled=next_cursor is None):
+            page_cursors.append(next_cursor)
+            st.rerun()
+        if rows.empty:
+            st.info("Bu hesapta işlem bulunamadı.")
+            return
+        shown = pd.DataFrame({
+            'Tarih': rows['date'].dt.strftime('%Y-%m-%d'),
+            'Tür': rows['type'].map({'Income': 'Gelir', 'Expense': 'Gider'}).fillna(rows['type']),
+            'Kategori': rows['category'],
+            'Açıklama': rows['description'],
+            'Tutar': rows['amount'].where(rows['type'] == 'Income', -rows['amount']),
+            'Bakiye': rows['balance'],
+        })
+        st.dataframe(shown, hide_index=True, width='stretch', column_config={'Tutar': money, 'Bakiye': money})
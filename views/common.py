@@ -0,0 +1,65 @@
+"""Helpers shared by the pages: the process-wide store, list filters and rerun metrics."""
+import collections
+import os
+from typing import Any, Dict
+
+import streamlit as st
+
+from findash import metrics
+from findash.db import DB_PATH
+from findash.ledger import LedgerStore
+from findash.schema import init_db
+
+PERF_HISTORY_SIZE = 20
+METRICS_LOG_PATH = os.getenv("FINDASH_METRICS_LOG", os.path.join(os.path.dirname(DB_PATH), 'findash_metrics.jsonl'))
+
+@st.cache_resource
+def get_store() -> LedgerStore:
+    """Process-wide ledger/account cache shared by every browser session."""
+    # Şema göçleri veritabanı dosyası başına bir kez uygulanır (findash.schema)
+    init_db()
+    store = LedgerStore()
+    store.sync()
+    return store
+
+def get_transaction_categories():
+    return ["Maaş", "Kira", "Eğlence", "Alışveriş", "Kıyafet", "Yemek", "Sağlık", "Seyahat"]
+
+def get_payment_methods():
+    """Returns a list of payment methods: All accounts from DB."""
+    return [acc['name'] for acc in get_store().accounts]
+
+def get_list_filters() -> Dict[str, Any]:
+    """Current filters of the transaction list, as keyword arguments for the SQL queries."""
+    tf_type = st.session_state.get('tx_filter_type')
+    return {
+        't_type': ('Income' if tf_type == 'Gelir' else 'Expense') if tf_type and tf_type != 'Tümü' else None,
+        'min_date': st.session_state.get('tx_filter_min_date'),
+        'max_date': st.session_state.get('tx_filter_max_date'),
+        'category': st.session_state['tx_filter_cat'] if st.session_state.get('tx_filter_cat') not in (None, 'Tümü') else None,
+        'search': st.session_state.get('tx_filter_search', '').strip(),
+    }
+
+def record_run(run):
+    record = run.finish()
+    st.session_state.setdefault('perf_history', collections.deque(maxlen=PERF_HISTORY_SIZE)).appendleft(record)
+    if st.session_state.get('perf_log'):
+        metrics.enable_log_file(METRICS_LOG_PATH)
+        metrics.log_run(record)
+
+def start_perf_run():
+    """Starts this rerun's metrics run; one cut short by ``st.rerun()`` is recorded first."""
+    interrupted = st.session_state.pop('perf_run', None)
+    if interrupted is not None:
+        interrupted.label += " (rerun)"
+        record_run(interrupted)
+    if st.session_state.get('perf_enabled'):
+        st.session_state['perf_run'] = metrics.start_run(trace_memory=st.session_state.get('perf_memory', False))
+    else:
+        metrics.stop_run()
+
+def finish_perf_run():
+    run = st.session_state.pop('perf_run', None)
+    if run is not None:
+        record_run(run)
+        metrics.stop_run()
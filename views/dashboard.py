@@ -0,0 +1,156 @@
+"""Dashboard page: period totals and the Plotly charts, cached across sessions."""
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from findash import metrics
+from findash.lru import LRUCache
+from findash.rates import convert
+from views.common import get_store
+
+DASHBOARD_CSS = """
+<style>
+    div[data-testid="stMetric"] {
+        background-color: #e6f3ff;
+        border: 1px solid #c7e6ff;
+        padding: 15px;
+        border-radius: 10px;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.05);
+        color: #0f172a;
+    }
+    div[data-testid="stMetric"] * { color: inherit !important; }
+    [data-theme="dark"] div[data-testid="stMetric"] {
+        background-color: #072033;
+        border: 1px solid #12394a;
+        color: #e6eef8;
+    }
+    [data-theme="dark"] div[data-testid="stMetric"] * { color: inherit !important; }
+    div[data-testid="stPlotlyChart"] > div {
+        border-radius: 14px;
+        overflow: hidden;
+        background-color: #803811;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.08);
+    }
+    div[data-testid="stPlotlyChart"] .plotly-graph-div {
+        background-color: transparent !important;
+    }
+</style>
+"""
+
+FIGURE_CACHE_SIZE = 64
+FIGURE_LAYOUT = dict(paper_bgcolor='#803811', plot_bgcolor='#803811', font=dict(color='white', size=14),
+                     title=dict(font=dict(size=16)), margin=dict(l=6, r=6, t=30, b=6))
+
+@st.cache_resource
+def get_figure_cache() -> LRUCache:
+    """Dashboard figures shared by every session; keys carry the data versions."""
+    return LRUCache(maxsize=FIGURE_CACHE_SIZE)
+
+def style_figure(fig, **trace_style):
+    fig.update_traces(textfont=dict(size=14, color='white'), **trace_style)
+    fig.update_layout(**FIGURE_LAYOUT)
+    return fig
+
+@metrics.instrumented()
+def get_total_assets():
+    store = get_store()
+    accounts = pd.DataFrame(list(store.accounts), columns=['balance', 'currency'])
+    return float(convert(accounts, store.rates(), amount='balance').sum())
+
+def render():
+    st.markdown(DASHBOARD_CSS, unsafe_allow_html=True)
+    st.subheader("Finansal Genel Bakış")
+    # Tüm grafikler ham işlemler yerine aylık özet tablosundan beslenir
+    summary, summary_version = get_store().versioned_summary()
+    
+    col_filter1, col_filter2 = st.columns([3, 1])
+    with col_filter1:
+        months = ["Tüm Zamanlar"]
+        if not summary.empty:
+            months += sorted(summary['month'].unique(), reverse=True)
+        selected_month = st.selectbox("Dönem Seçiniz", months)
+    
+    if selected_month != "Tüm Zamanlar":
+        period = summary[summary['month'] == selected_month]
+    else:
+        period = summary
+
+    type_totals = period.groupby('type')['total_base'].sum()
+    total_income = type_totals.get('Income', 0.0)
+    total_expense = type_totals.get('Expense', 0.0)
+    
+    # Banka dahil TÜM varlıklar
+    assets = get_total_assets()
+    
+    bank_names = [acc['name'] for acc in get_store().accounts]
+    
+    # Net Worth hesaplama
+    # Eğer bakiyeler otomatik güncelleniyorsa (güncelledik), aslında "Toplam Varlık" = get_total_assets().
+    # Ancak "Toplam Varlık (Net)" kurgusu önceki koddaydı.
+    # Artık her şey bir "Hesap" olduğu için, tüm hesapların toplamı Net Varlıktır.
+    net_worth = assets
+
+    c1, c2, c3 = st.columns([1, 1, 1])
+    c1.metric("Toplam Varlık (Net)", f"₺{net_worth:,.2f}", "Tüm Hesaplar", delta_color="normal")
+    c2.metric(f"{selected_month} Gelir", f"₺{total_income:,.2f}", f"+₺{total_income:,.2f}")
+    c3.metric(f"{selected_month} Gider", f"₺{total_expense:,.2f}", f"-₺{total_expense:,.2f}", delta_color="inverse")
+
+    st.markdown("---")
+
+    row1 = st.columns(3)
+    row2 = st.columns(3)
+    colors = px.colors.qualitative.Pastel
+
+    # Grafikler (özetin hesaplandığı sürümler, dönem, tema) anahtarıyla süreç genelinde önbelleklenir;
+    # sürümü belirsiz bir özetten (okuma sırasında yazım) üretilen grafikler önbelleğe girmez
+    store = get_store()
+    figure_key = summary_version + (selected_month, st.context.theme.type) if summary_version else None
+
+    def show_figure(name, build):
+        with metrics.section(f'chart.{name}'):
+            fig = get_figure_cache().get_or_build(figure_key + (name,), build) if figure_key else build()
+            if fig is not None:
+                st.plotly_chart(fig, width='stretch', height=300)
+
+    def income_expense_figure():
+        pie_data = pd.DataFrame({'Label': ['Gelir', 'Gider'], 'Value': [total_income, total_expense]})
+        fig = px.pie(pie_data, names='Label', values='Value', title='Gelir vs Gider', hole=0.0, color_discrete_sequence=['#22c55e', '#ef4444'])
+        return style_figure(fig, marker=dict(line=dict(color='#803811', width=0)))
+
+    def expense_category_figure():
+        exp_cat = period[period['type'] == 'Expense'].groupby('category')['total_base'].sum().reset_index(name='amount')
+        return style_figure(px.pie(exp_cat, names='category', values='amount', title='Gider Kategorileri', hole=0.5, color_discrete_sequence=colors))
+
+    def savings_figure():
+        savings = max(0, total_income - total_expense)
+        sav_data = pd.DataFrame({'Label': ['Tasarruf', 'Harcama'], 'Value': [savings, total_expense]})
+        return style_figure(px.pie(sav_data, names='Label', values='Value', title='Tasarruf Oranı', hole=0.6, color_discrete_sequence=['#3b82f6', '#94a3b8']))
+
+    def count_figure():
+        counts = period.groupby('type')['count'].sum().reset_index()
+        return style_figure(px.pie(counts, names='type', values='count', title='İşlem Adetleri', color_discrete_sequence=['#ef4444', '#22c55e']))
+
+    def top_expense_figure():
+        top_exp = store.top_expenses(None if selected_month == "Tüm Zamanlar" else selected_month)
+        return style_figure(px.pie(top_exp, names='category', values='amount', title='En Büyük 5 Harcama', hole=0.4))
+
+    def assets_figure():
+        bank_df = pd.DataFrame(list(store.accounts))
+        if bank_df.empty:
+            return None
+        bank_df['TRY_Value'] = convert(bank_df, store.rates(), amount='balance')
+        return style_figure(px.pie(bank_df, names='name', values='TRY_Value', title='Tüm Varlıklar Dağılımı', hole=0.5, color_discrete_sequence=px.colors.sequential.Plasma))
+
+    with metrics.section('dashboard_charts'):
+        with row1[0]:
+            show_figure('income_expense', income_expense_figure)
+        with row1[1]:
+            show_figure('expense_category', expense_category_figure)
+        with row1[2]:
+            show_figure('savings', savings_figure)
+        with row2[0]:
+            show_figure('count', count_figure)
+        with row2[1]:
+            show_figure('top_expense', top_expense_figure)
+        with row2[2]:
+            show_figure('assets', assets_figure)
@@ -0,0 +1,244 @@
+"""Ayarlar page: data reset, debug and metrics panel, reconciliation, import and export."""
+import datetime
+from typing import Any, Dict, List
+
+import pandas as pd
+import streamlit as st
+
+from findash import db, metrics, writer
+from findash.accounts import archive_year, clear_ledger, load_accounts
+from findash.archive import list_archives
+from findash.balances import rebuild_balances, reconcile
+from findash.compact import from_minor, memory_bytes
+from findash.db import DB_PATH
+from findash.exporter import EXPORT_FORMATS, EXPORT_TABLES, export_bytes
+from findash.generator import write_synthetic
+from findash.importer import import_csv, import_ofx, import_rates
+from findash.ledger import ACCOUNTS_VERSION_KEY, bump_version
+from views.common import METRICS_LOG_PATH, get_list_filters, get_payment_methods, get_store, get_transaction_categories
+
+@metrics.instrumented()
+def load_bank_accounts_from_db() -> List[Dict[str, Any]]:
+    with db.connection() as conn:
+        return load_accounts(conn)
+
+@metrics.instrumented()
+def load_archives() -> List[Dict[str, Any]]:
+    with db.connection() as conn:
+        return list_archives(conn)
+
+@metrics.instrumented()
+def clear_and_seed_demo_db(rows: int = 120, days: int = 60, seed=None):
+    """Replaces all data with the demo accounts and ``rows`` synthetic transactions."""
+    def seed_demo(conn):
+        clear_ledger(conn)
+        write_synthetic(conn, rows, seed=seed, days=days)
+    writer.write(seed_demo)
+
+@metrics.instrumented()
+def clear_db():
+    writer.write(clear_ledger)
+
+def render():
+    st.subheader("Uygulama Ayarları")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.warning("Verileri Sıfırla")
+        if st.button("Bütün Verileri Temizle", key="request_clear"):
+            st.session_state['confirm_clear'] = True
+            st.rerun()
+
+        if st.session_state.get('confirm_clear'):
+            with st.expander("Onayla", expanded=True):
+                st.warning("Bu işlem geri alınamaz. Tüm verileri silmek istediğinize emin misiniz?")
+                col_yes, col_no = st.columns([1,1])
+                if col_yes.button("Evet, Sil", key="confirm_yes_clear"):
+                    clear_db()
+                    get_store().sync()
+                    st.success("Veriler temizlendi.")
+                    st.session_state.pop('confirm_clear', None)
+                    st.rerun()
+                if col_no.button("İptal", key="confirm_no_clear"):
+                    st.session_state.pop('confirm_clear', None)
+                    st.info("İşlem iptal edildi.")
+                    st.rerun()
+            
+    with col2:
+        st.info("Tema Ayarı")
+        st.write("Streamlit temasını değiştirmek için sağ üstteki 'Settings' menüsünü kullanabilirsiniz (Dark/Light Mode).")
+        with st.expander("DB Durumu (Debug)"):
+            st.write(f"DB dosyası: `{DB_PATH}`")
+            try:
+                # Süreç genelindeki sıkıştırılmış defter; yeniden okunmaz
+                tx = get_store().ledger.transactions
+                ba = load_bank_accounts_from_db()
+                st.write(f"Toplam İşlem (DB): {len(tx)}")
+                archived_rows = sum(a['rows'] for a in load_archives())
+                if archived_rows:
+                    st.write(f"Arşivdeki İşlem: {archived_rows}")
+                st.write(f"Bellekteki Defter: {memory_bytes(tx) / 2**20:,.2f} MB")
+                st.write(f"Toplam Hesap (DB): {len(ba)}")
+                if not tx.empty:
+                    st.write("Son 5 işlem:")
+                    st.dataframe(tx.head(5).assign(amount=lambda d: from_minor(d['amount_minor']).to_numpy()).drop(columns='amount_minor'))
+                if ba:
+                    st.write("Tüm Hesaplar (DB):")
+                    st.json(ba)
+            except Exception as e:
+                st.error(f"DB okunamadı: {e}")
+
+            st.markdown("**Performans Ölçümü**")
+            # Ayarlar widget dışında saklanır; başka sayfadayken de geçerli kalır
+            perf_cols = st.columns(3)
+            st.session_state['perf_enabled'] = perf_cols[0].toggle("Ölçümü Aç", value=st.session_state.get('perf_enabled', False))
+            st.session_state['perf_memory'] = perf_cols[1].toggle("Bellek Tepe Değeri", value=st.session_state.get('perf_memory', False),
+                                                                  help="tracemalloc açıkken sayfalar yavaşlar.")
+            st.session_state['perf_log'] = perf_cols[2].toggle("JSON Log", value=st.session_state.get('perf_log', False),
+                                                               help=f"Her çalıştırma bir satır olarak `{METRICS_LOG_PATH}` dosyasına yazılır.")
+            history = list(st.session_state.get('perf_history', []))
+            if history:
+                st.write("Son çalıştırmalar (en yenisi üstte):")
+                st.dataframe(pd.DataFrame([{
+                    'Sayfa': r['label'], 'Süre (ms)': round(r['seconds'] * 1000, 1), 'Sorgu': r['queries'],
+                    'Satır': r['rows'], 'Bellek Tepe (KB)': r['peak_kb'],
+                } for r in history]), hide_index=True, width='stretch')
+                picked = st.selectbox("Bölümler", range(len(history)), key="perf_pick",
+                                      format_func=lambda i: f"{i + 1}. {history[i]['label']}")
+                sections = pd.DataFrame(history[picked]['sections'])
+                if not sections.empty:
+                    sections['name'] = ['  ' * d + n for d, n in zip(sections['depth'], sections['name'])]
+                    st.dataframe(sections.drop(columns='depth'), hide_index=True, width='stretch')
+            elif st.session_state.get('perf_enabled'):
+                st.caption("Ölçüm sonraki çalıştırmadan itibaren kaydedilir.")
+    st.markdown("---")
+    with st.expander("Bakiye Mutabakatı", expanded=False):
+        st.caption("Hesap bakiyeleri, açılış bakiyesi ile işlem defterinden yeniden hesaplanan bakiyeyle karşılaştırılır.")
+        col_check, col_fix = st.columns(2)
+        if col_check.button("Kontrol Et", key="reconcile_check"):
+            with db.connection() as conn:
+                st.session_state['reconcile_report'] = reconcile(conn)
+        if col_fix.button("Bakiyeleri Defterden Yeniden Hesapla", key="reconcile_fix"):
+            def rebuild(conn):
+                report = rebuild_balances(conn)
+                bump_version(conn, ACCOUNTS_VERSION_KEY)
+                return report
+            st.session_state['reconcile_report'] = writer.write(rebuild)
+            get_store().sync()
+            st.success("Bakiyeler ve kontrol noktaları yeniden oluşturuldu.")
+        report = st.session_state.get('reconcile_report')
+        if report is not None:
+            drift = report[report['difference'] != 0]
+            if drift.empty:
+                st.success("Tüm hesap bakiyeleri defterle uyumlu.")
+            else:
+                st.warning(f"{len(drift)} hesapta fark bulundu.")
+            st.dataframe(report.drop(columns='id'), hide_index=True, width='stretch')
+
+    with st.expander("Arşiv (Kapanmış Yıllar)", expanded=False):
+        st.caption("Kapanmış bir yılın işlemleri ayrı bir dosyaya taşınır; özetler ve bakiyeler değişmez. "
+                   "Arşivlenen yıllar salt okunurdur ve yalnızca tarih aralığı onlara uzanan sorgularda açılır.")
+        archives = load_archives()
+        if archives:
+            st.dataframe(pd.DataFrame(archives), hide_index=True, width='stretch')
+        archived = {a['year'] for a in archives}
+        months = get_store().monthly_summary()['month']
+        closed = sorted({int(m[:4]) for m in months if m[:4].isdigit()} - archived)
+        closed = [y for y in closed if y < datetime.date.today().year]
+        if closed:
+            col_year, col_run = st.columns([2, 1])
+            year = col_year.selectbox("Yıl", closed, key="archive_year")
+            if col_run.button("Arşivle", key="archive_run"):
+                try:
+                    result = writer.write(archive_year, year)
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    get_store().sync()
+                    st.success(f"{result['year']} yılının {result['rows']:,} işlemi arşivlendi.")
+        else:
+            st.info("Arşivlenebilecek kapanmış yıl yok.")
+
+    with st.expander("Ekstre İçe Aktar (CSV / OFX)", expanded=False):
+        upload = st.file_uploader("Ekstre Dosyası", type=["csv", "ofx", "qfx"], key="import_file")
+        col_acc, col_cat = st.columns(2)
+        with col_acc:
+            import_account = st.selectbox("Hesap", get_payment_methods(), key="import_account")
+        with col_cat:
+            import_category = st.selectbox("Varsayılan Kategori", get_transaction_categories(), index=3, key="import_category")
+
+        if upload is not None:
+            is_ofx = upload.name.lower().endswith(('.ofx', '.qfx'))
+            if not is_ofx:
+                col_sep, col_dec, col_day = st.columns(3)
+                with col_sep:
+                    csv_sep = st.selectbox("Ayırıcı", [",", ";", "\t"], key="import_sep", format_func=lambda x: "TAB" if x == "\t" else x)
+                with col_dec:
+                    csv_decimal = st.selectbox("Ondalık Ayırıcı", [".", ","], key="import_decimal")
+                with col_day:
+                    csv_dayfirst = st.checkbox("Gün önce (GG.AA.YYYY)", value=True, key="import_dayfirst")
+
+                header = pd.read_csv(upload, sep=csv_sep, nrows=0).columns.tolist()
+                upload.seek(0)
+                options = ["—"] + header
+                guesses = {'date': ('tarih', 'date'), 'amount': ('tutar', 'amount', 'miktar'),
+                           'description': ('açıklama', 'aciklama', 'description'), 'category': ('kategori', 'category'),
+                           'type': ('tür', 'tur', 'type')}
+                mapping = {}
+                map_cols = st.columns(5)
+                for map_col, (field, label) in zip(map_cols, [('date', 'Tarih'), ('amount', 'Tutar'), ('description', 'Açıklama'),
+                                                              ('category', 'Kategori'), ('type', 'Tür')]):
+                    guess = next((i for i, h in enumerate(options) if any(g in h.lower() for g in guesses[field])), 0)
+                    with map_col:
+                        choice = st.selectbox(label, options, index=guess, key=f"import_map_{field}")
+                    if choice != "—":
+                        mapping[field] = choice
+
+            if st.button("İçe Aktar", key="run_import"):
+                upload.seek(0)
+                try:
+                    if is_ofx:
+                        result = import_ofx(upload, import_account, import_category)
+                    elif 'date' not in mapping or 'amount' not in mapping:
+                        raise ValueError("Tarih ve Tutar sütunları seçilmelidir.")
+                    else:
+                        result = import_csv(upload, mapping, import_account, import_category,
+                                            dayfirst=csv_dayfirst, decimal=csv_decimal, sep=csv_sep)
+                    get_store().sync()
+                    st.success(f"{result['rows']:,} işlem {result['seconds']:.1f} sn içinde aktarıldı "
+                               f"({result['rows_per_sec']:,.0f} satır/sn).")
+                except Exception as e:
+                    st.error(f"İçe aktarma hatası: {e}")
+
+    with st.expander("Döviz Kurları (CSV)", expanded=False):
+        st.caption("Sütunlar: date, currency, rate (1 birim = rate TRY). Aynı gün ve para birimi için yeni kur eskisinin yerine geçer.")
+        rates_upload = st.file_uploader("Kur Dosyası", type=["csv"], key="rates_file")
+        if rates_upload is not None and st.button("Kurları Yükle", key="run_rates_import"):
+            try:
+                written = import_rates(rates_upload)
+                get_store().sync()
+                st.success(f"{written:,} kur kaydı yüklendi.")
+            except Exception as e:
+                st.error(f"Kur yükleme hatası: {e}")
+        latest = get_store().rates().groupby('currency').last()
+        if not latest.empty:
+            st.dataframe(latest, width='stretch')
+
+    with st.expander("Dışa Aktar (CSV / Parquet)", expanded=False):
+        col_tbl, col_fmt, col_flt = st.columns(3)
+        with col_tbl:
+            export_table = st.selectbox("Tablo", EXPORT_TABLES, key="export_table",
+                                        format_func=lambda t: "İşlemler" if t == 'transactions' else "Hesaplar")
+        with col_fmt:
+            export_fmt = st.selectbox("Biçim", EXPORT_FORMATS, format_func=str.upper, key="export_format")
+        with col_flt:
+            use_list_filters = st.checkbox("İşlem listesi filtrelerini uygula", value=True, key="export_use_filters")
+        export_filters = get_list_filters() if use_list_filters and export_table == 'transactions' else None
+        # Dosya yalnızca tıklanınca üretilir ve indirme için tamamı bellekte tutulur; bellek sınırlı yol CLI (export_to_file)
+        st.download_button(
+            "İndir",
+            data=lambda: export_bytes(export_fmt, export_table, export_filters),
+            file_name=f"{export_table}.{export_fmt}",
+            mime="text/csv" if export_fmt == 'csv' else "application/vnd.apache.parquet",
+            key="export_download",
+        )
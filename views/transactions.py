@@ -0,0 +1,285 @@
+"""İşlem Ekle page: the add/edit form and the paginated transaction list."""
+import datetime
+from typing import Any, Dict
+
+import pandas as pd
+import streamlit as st
+
+from findash import db, metrics, writer
+from findash.archive import list_archives
+from findash.queries import TX_PAGE_SIZE, load_transactions_page
+from findash.transactions import delete_row, insert_row, update_row
+from views.common import get_list_filters, get_payment_methods, get_store, get_transaction_categories
+
+TX_PAGE_SIZE_OPTIONS = [25, 50, 100, 250, 500]
+
+@metrics.instrumented()
+def get_transaction_date_range():
+    with db.connection() as conn:
+        # Arşivlenmiş yıllar da aralığa dahil; liste sayfaları onlara uzandığında arşivler bağlanır
+        row = conn.execute(
+            "SELECT MIN(lo), MAX(hi) FROM (SELECT (SELECT MIN(date) FROM transactions) AS lo, (SELECT MAX(date) FROM transactions) AS hi"
+            " UNION ALL SELECT MIN(min_date), MAX(max_date) FROM archives)"
+        ).fetchone()
+    today = datetime.date.today()
+    return (pd.to_datetime(row[0]).date() if row[0] else today,
+            pd.to_datetime(row[1]).date() if row[1] else today)
+
+@metrics.instrumented()
+def get_transaction_by_id(tx_id: int) -> Dict[str, Any]:
+    with db.connection() as conn:
+        row = conn.execute("SELECT * FROM transactions WHERE id = ?", (tx_id,)).fetchone()
+    if not row:
+        return None
+    d = dict(row)
+    try:
+        d['date'] = pd.to_datetime(d['date'])
+    except Exception:
+        pass
+    return d
+
+@metrics.instrumented()
+def add_transaction(t_type, amount, category, date, desc, payment_method):
+    """Queues the insert on the writer thread and waits until it is committed."""
+    future = writer.submit(insert_row, t_type, amount, category, date, desc, payment_method)
+    version, row = future.result()
+    get_store().apply(version, upserts=[row])
+
+def render():
+    st.subheader("Yeni Gelir veya Gider Ekle")
+    
+    if 'tx_type_selection' not in st.session_state:
+        st.session_state.tx_type_selection = 'Income'
+
+    editing_tx = st.session_state.get('editing_tx')
+    if editing_tx:
+        tx = get_transaction_by_id(editing_tx)
+        if tx:
+            st.session_state.tx_type_selection = tx['type']
+
+    # TÜR SEÇİMİ
+    col_type1, col_type2 = st.columns(2)
+    with col_type1:
+        if st.button("📉 GİDER", use_container_width=True, key="btn_expense_select"):
+            st.session_state.tx_type_selection = 'Expense'
+            st.rerun()
+    
+    with col_type2:
+        if st.button("📈 GELİR", use_container_width=True, key="btn_income_select"):
+            st.session_state.tx_type_selection = 'Income'
+            st.rerun()
+
+    sel_type = st.session_state.tx_type_selection
+    if sel_type == 'Income':
+        st.success(f"**Seçilen:** :green[+ GELİR]", icon="🟢")
+    else:
+        st.error(f"**Seçilen:** :red[- GİDER]", icon="🔴")
+    
+    st.markdown("---")
+
+    # DÜZENLEME
+    if editing_tx:
+        tx = get_transaction_by_id(editing_tx)
+        if not tx:
+            st.error("Düzenlenecek işlem bulunamadı.")
+            st.session_state.pop('editing_tx', None)
+        else:
+            with st.form("edit_transaction_form"):
+                t_type = st.session_state.tx_type_selection 
+                col1, col2 = st.columns(2)
+                with col1:
+                    amount = st.number_input("Tutar", min_value=0.01, value=float(tx['amount']), format="%.2f")
+                with col2:
+                    date = st.date_input("Tarih", pd.to_datetime(tx['date']).date())
+                
+                payment_methods = get_payment_methods()
+                current_pm = tx.get('payment_method')
+                if current_pm not in payment_methods:
+                    payment_methods.append(current_pm)
+                
+                payment_method = st.selectbox("Ödeme Yöntemi / Kaynak", payment_methods, index=payment_methods.index(current_pm))
+                
+                categories = get_transaction_categories()
+                category = st.selectbox("Kategori", categories, index=categories.index(tx['category']) if tx['category'] in categories else 0)
+
+                desc = st.text_area("Açıklama", tx.get('description',''))
+                
+                col_ok, col_cancel = st.columns([1,1])
+                with col_ok:
+                    if st.form_submit_button("Güncelle"):
+                        try:
+                            version, row = writer.submit(update_row, editing_tx, t_type, amount, category, date, desc,
+                                                         payment_method).result()
+                            get_store().apply(version, upserts=[row])
+                            st.success("İşlem ve bakiye güncellendi!")
+                            st.session_state.pop('editing_tx', None)
+                            st.session_state['tx_table_gen'] = st.session_state.get('tx_table_gen', 0) + 1
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Güncelleme hatası: {e}")
+                with col_cancel:
+                    if st.form_submit_button("İptal", key="cancel_edit"):
+                        st.session_state.pop('editing_tx', None)
+                        st.rerun()
+
+    # YENİ EKLEME
+    if not st.session_state.get('editing_tx'):
+        with st.form("transaction_form"):
+            t_type = st.session_state.tx_type_selection
+            col1, col2 = st.columns(2)
+            with col1:
+                amount = st.number_input("Tutar", min_value=0.01, format="%.2f")
+            with col2:
+                date = st.date_input("Tarih", datetime.date.today())
+            
+            payment_methods = get_payment_methods()
+            payment_method = st.selectbox("Ödeme Yöntemi / Kaynak", payment_methods, index=0)
+            
+            categories = get_transaction_categories()
+            default_idx = 0 
+            if t_type == 'Expense':
+                default_idx = 3
+            
+            category = st.selectbox("Kategori", categories, index=default_idx)
+
+            desc = st.text_area("Açıklama")
+            submitted = st.form_submit_button("Kaydet")
+
+            if submitted:
+                try:
+                    add_transaction(t_type, amount, category, date, desc, payment_method)
+                except Exception as e:
+                    st.error(f"Kayıt hatası: {e}")
+                else:
+                    st.success("İşlem başarıyla eklendi!")
+
+    st.markdown("---")
+
+    # LİSTELEME
+    with metrics.section('transaction_list'):
+        st.markdown("### Mevcut İşlemler")
+
+        # Filtreler
+        if 'tx_filter_type' not in st.session_state:
+            st.session_state['tx_filter_type'] = 'Tümü'
+        if 'tx_filter_cat' not in st.session_state:
+            st.session_state['tx_filter_cat'] = 'Tümü'
+        if 'tx_filter_search' not in st.session_state:
+            st.session_state['tx_filter_search'] = ''
+        if 'tx_filter_min_date' not in st.session_state or 'tx_filter_max_date' not in st.session_state:
+            min_date, max_date = get_transaction_date_range()
+            st.session_state.setdefault('tx_filter_min_date', min_date)
+            st.session_state.setdefault('tx_filter_max_date', max_date)
+
+        with st.expander("Filtreler", expanded=False):
+            col_type, col_min, col_max, col_cat, col_search, col_clear = st.columns([1,1,1,1,2,0.6])
+            with col_type:
+                st.selectbox("Tür", ["Tümü", "Gelir", "Gider"], key='tx_filter_type', format_func=lambda x: 'Income' if x=='Gelir' else ('Expense' if x=='Gider' else x))
+            with col_min:
+                st.date_input("Başlangıç", key='tx_filter_min_date')
+            with col_max:
+                st.date_input("Bitiş", key='tx_filter_max_date')
+            with col_cat:
+                categories = ["Tümü"] + get_transaction_categories()
+                st.selectbox("Kategori", categories, key='tx_filter_cat')
+            with col_search:
+                st.text_input("Ara", key='tx_filter_search', placeholder="Örn: market, maaş")
+            with col_clear:
+                st.write("")
+                if st.button("Temizle", key="clear_filters"):
+                    st.session_state.pop('tx_filter_type', None)
+                    st.session_state.pop('tx_filter_cat', None)
+                    st.session_state.pop('tx_filter_search', None)
+                    st.session_state.pop('tx_filter_min_date', None)
+                    st.session_state.pop('tx_filter_max_date', None)
+                    st.rerun()
+
+        tx_filters = get_list_filters()
+
+        if 'tx_page_size' not in st.session_state:
+            st.session_state['tx_page_size'] = TX_PAGE_SIZE
+        page_size = st.session_state['tx_page_size']
+
+        # Sayfalama: her sayfanın başlangıç imleci saklanır, filtre değişince başa dönülür
+        filter_key = repr(sorted(tx_filters.items())) + f"|{page_size}"
+        if st.session_state.get('tx_page_filter_key') != filter_key:
+            st.session_state['tx_page_filter_key'] = filter_key
+            st.session_state['tx_page_cursors'] = [None]
+        page_cursors = st.session_state['tx_page_cursors']
+        tx_filtered, next_cursor = load_transactions_page(tx_filters, cursor=page_cursors[-1], limit=page_size)
+
+        st.write(f"Sonuç: **{len(tx_filtered)}** işlem gösteriliyor (Sayfa {len(page_cursors)})")
+        col_prev, col_next, col_size = st.columns([1, 1, 1])
+        if col_prev.button("◀ Önceki", key="tx_prev_page", disabled=len(page_cursors) == 1):
+            page_cursors.pop()
+            st.rerun()
+        if col_next.button("Sonraki ▶", key="tx_next_page", disabled=next_cursor is None):
+            page_cursors.append(next_cursor)
+            st.rerun()
+        col_size.selectbox("Sayfa Boyutu", TX_PAGE_SIZE_OPTIONS, key='tx_page_size', label_visibility="collapsed")
+
+        if tx_filtered.empty:
+            st.info("Filtrelere uygun işlem bulunamadı.")
+        else:
+            # Tek bir sanal tablo: satır başına widget yerine seçili satırlar üzerinde aksiyon
+            tx_view = pd.DataFrame({
+                'Tarih': tx_filtered['date'].dt.date,
+                'Tür': tx_filtered['type'].map({'Income': '🟢 GELİR', 'Expense': '🔴 GİDER'}),
+                'Kategori': tx_filtered['category'],
+                'Tutar': tx_filtered['amount'],
+                'Yöntem': tx_filtered['payment_method'],
+                'Açıklama': tx_filtered['description'],
+            })
+            table_key = f"tx_table_{st.session_state.get('tx_table_gen', 0)}_{abs(hash(filter_key))}_{len(page_cursors)}"
+            table = st.dataframe(
+                tx_view,
+                hide_index=True,
+                column_config={'Tutar': st.column_config.NumberColumn(format="%.2f")},
+                on_select="rerun",
+                selection_mode="multi-row",
+                key=table_key,
+            )
+            selected_ids = [int(tx_filtered['id'].iloc[i]) for i in table.selection.rows]
+            # Arşivlenmiş yılların satırları salt okunurdur; düzenleme ve silme yalnızca açık defterde
+            with db.connection() as conn:
+                archived_years = {a['year'] for a in list_archives(conn)}
+            selected_archived = any(tx_filtered['date'].iloc[i].year in archived_years for i in table.selection.rows)
+            if selected_archived:
+                st.info("Seçimde arşivlenmiş yıllara ait işlemler var; arşivler salt okunurdur, düzenlenemez ve silinemez.")
+
+            btn_edit_col, btn_del_col, _ = st.columns([1, 1, 4])
+            if btn_edit_col.button("Düzenle", key="edit_selected", disabled=len(selected_ids) != 1 or selected_archived):
+                st.session_state['editing_tx'] = selected_ids[0]
+                st.rerun()
+
+            if btn_del_col.button(f"Sil ({len(selected_ids)})", key="del_selected", disabled=not selected_ids or selected_archived):
+                for row_id in selected_ids:
+                    st.session_state[f'confirm_del_{row_id}'] = True
+                st.rerun()
+
+        pending_deletes = [int(k[len('confirm_del_'):]) for k in list(st.session_state.keys())
+                           if k.startswith('confirm_del_') and st.session_state[k]]
+        if pending_deletes:
+            with st.expander("Silme Onayı", expanded=True):
+                st.warning(f"Seçili {len(pending_deletes)} işlemi silmek istediğinize emin misiniz?")
+                col_yes, col_no = st.columns([1,1])
+                if col_yes.button("Evet, Sil", key="confirm_yes_selected"):
+                    # Silmeler birlikte kuyruğa alınır; yazıcı onları tek işlemde yazar, her biri ayrı başarısız olabilir
+                    futures = {row_id: writer.submit(delete_row, row_id) for row_id in pending_deletes}
+                    errors = []
+                    for row_id, future in futures.items():
+                        st.session_state.pop(f'confirm_del_{row_id}', None)
+                        try:
+                            get_store().apply(future.result(), deletes=[row_id])
+                        except Exception as e:
+                            errors.append(str(e))
+                    st.session_state['tx_table_gen'] = st.session_state.get('tx_table_gen', 0) + 1
+                    if errors:
+                        st.error("Silme hatası: " + " ".join(errors))
+                    else:
+                        st.success("İşlem silindi ve bakiye düzeltildi.")
+                        st.rerun()
+                if col_no.button("İptal", key="confirm_no_selected"):
+                    for row_id in pending_deletes:
+                        st.session_state.pop(f'confirm_del_{row_id}', None)
+                    st.rerun()